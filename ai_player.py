@@ -0,0 +1,97 @@
+import queue
+import random
+import threading
+import time
+from array import array
+from collections import deque
+
+from game_core import MemoryGame
+from strategies import STRATEGIES
+
+
+class AIOpponent:
+    """
+    Plays one seat of the live game with a simulator strategy, on a worker thread. The game loop forwards
+    every new board, turned card and resolved pair; the worker applies them to its own copy of the game,
+    so the strategy never touches the game the loop is drawing. When asked for a pick, the worker works it
+    out, waits think_time seconds so players can follow, and leaves the card index in moves.
+    """
+
+    def __init__(self, strategy, player=2, think_time=0.6, seed=None, on_move=None):
+        self.player = player
+        self.think_time = think_time
+        self.on_move = on_move  # Called on the worker thread after each move, e.g. to wake the game loop
+        self.moves = deque()  # (board generation, card index); appended by the worker, popped by the game loop
+        self.thinking = False
+        self._strategy = STRATEGIES[strategy](random.Random(seed))
+        self._generation = 0
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='ai-opponent')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def new_board(self, game):
+        self._generation += 1
+        self.moves.clear()
+        self.thinking = False
+        self._requests.put(('board', self._generation, game.cols, game.rows, game.num_players,
+                            array('H', game.board)))
+
+    def turned(self, index):
+        self._requests.put(('turned', index))
+
+    def resolved(self):
+        self._requests.put(('resolved',))
+
+    def request_move(self):
+        """
+        Asks the worker for the next card to turn over, unless it is already working on one.
+        """
+        if not self.thinking:
+            self.thinking = True
+            self._requests.put(('move', self._generation))
+
+    def poll(self):
+        """
+        Returns the card indices picked for the current board since the last poll.
+        """
+        picks = []
+
+        while self.moves:
+            generation, index = self.moves.popleft()
+            if generation == self._generation:  # Picks for an abandoned board are dropped
+                picks.append(index)
+                self.thinking = False
+
+        return picks
+
+    def close(self):
+        self._requests.put(None)
+
+    def _run(self):
+        game = None
+        generation = 0
+
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            if request[0] == 'board':
+                _, generation, cols, rows, num_players, board = request
+                game = MemoryGame(cols, rows, num_players=num_players)
+                game.board = board
+                self._strategy.reset(game)
+            elif request[0] == 'turned':
+                game.select(request[1])
+                self._strategy.observe(game, request[1])
+            elif request[0] == 'resolved':
+                game.resolve()
+            elif request[0] == 'move' and request[1] == generation:
+                started = time.perf_counter()
+                index = self._strategy.pick(game)
+                time.sleep(max(0.0, self.think_time - (time.perf_counter() - started)))
+
+                self.moves.append((generation, index))
+                if self.on_move is not None:
+                    self.on_move()
@@ -0,0 +1,121 @@
+from array import array
+
+
+def linear(t):
+    return t
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+EASINGS = [linear, ease_in_out_quad, ease_out_cubic]
+EASING_IDS = {easing.__name__: easing_id for easing_id, easing in enumerate(EASINGS)}
+
+
+class TweenBatch:
+    """
+    Time-based tweens stored as parallel arrays (one slot per active tween) instead of a dict of dicts.
+    update(now) advances every active tween in a single pass from real elapsed milliseconds, so animation
+    speed does not depend on the frame rate.
+    """
+
+    def __init__(self):
+        self._slots = {}  # key -> slot index
+        self._keys = []
+        self._starts = array('d')
+        self._durations = array('d')
+        self._easings = array('b')
+        self._values = array('d')  # Eased progress in [0, 1] as of the last update
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def __bool__(self):
+        return bool(self._keys)
+
+    def start(self, key, now, duration, easing='linear'):
+        """
+        Starts (or restarts) the tween for key at time now, running for duration milliseconds.
+        """
+        slot = self._slots.get(key)
+
+        if slot is None:
+            self._slots[key] = len(self._keys)
+            self._keys.append(key)
+            self._starts.append(now)
+            self._durations.append(duration)
+            self._easings.append(EASING_IDS[easing])
+            self._values.append(0.0)
+        else:
+            self._starts[slot] = now
+            self._durations[slot] = duration
+            self._easings[slot] = EASING_IDS[easing]
+            self._values[slot] = 0.0
+
+    def progress(self, key):
+        """
+        Returns the eased progress of the tween for key, or None if it is not animating.
+        """
+        slot = self._slots.get(key)
+
+        return None if slot is None else self._values[slot]
+
+    def update(self, now):
+        """
+        Advances every active tween to time now and drops the finished ones. Returns the finished keys.
+        """
+        finished = []
+        starts, durations, easings, values = self._starts, self._durations, self._easings, self._values
+
+        for slot in range(len(self._keys)):
+            t = (now - starts[slot]) / durations[slot] if durations[slot] > 0 else 1.0
+
+            if t >= 1.0:
+                values[slot] = 1.0
+                finished.append(self._keys[slot])
+            else:
+                values[slot] = EASINGS[easings[slot]](max(0.0, t))
+
+        for key in finished:
+            self.remove(key)
+
+        return finished
+
+    def remove(self, key):
+        """
+        Removes the tween for key by moving the last slot into its place.
+        """
+        slot = self._slots.pop(key, None)
+
+        if slot is None:
+            return
+
+        last = len(self._keys) - 1
+
+        if slot != last:
+            last_key = self._keys[last]
+            self._keys[slot] = last_key
+            self._starts[slot] = self._starts[last]
+            self._durations[slot] = self._durations[last]
+            self._easings[slot] = self._easings[last]
+            self._values[slot] = self._values[last]
+            self._slots[last_key] = slot
+
+        self._keys.pop()
+        self._starts.pop()
+        self._durations.pop()
+        self._easings.pop()
+        self._values.pop()
+
+    def clear(self):
+        self._slots.clear()
+        self._keys.clear()
+        del self._starts[:], self._durations[:], self._easings[:], self._values[:]
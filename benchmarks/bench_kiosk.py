@@ -0,0 +1,54 @@
+import itertools
+import tracemalloc
+
+import pygame
+
+from kiosk import Kiosk
+from timing import result
+
+SCREEN_SIZE = (1280, 720)
+BOARD_COUNTS = (1, 4, 16, 36)
+BOARD_SIZE = (4, 4)
+
+
+def run(options):
+    """
+    Times kiosk frames and measures the kiosk's Python memory for growing numbers of boards, to check that
+    idle boards add little: an idle frame, a frame with one board flipping, and the memory of the boards.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    font = pygame.font.SysFont("calibri", 20)
+    results = {}
+
+    for count in BOARD_COUNTS:
+        tracemalloc.start()
+        kiosk = Kiosk(screen, count, *BOARD_SIZE, font, seed=options.seed)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        now = pygame.time.get_ticks()
+        kiosk.tick(now)  # The first frame paints every board
+
+        # The clock stands still, so no timer moves and nothing needs repainting
+        results[f'kiosk.boards-{count}.idle_frame'] = options.measure(lambda: kiosk.tick(now))
+
+        # Two cards of the first board mid-flip, as while a pair is being revealed; the clock wraps so they
+        # never finish and the board's timer never moves
+        board = kiosk.boards[0]
+        clock = itertools.count()
+
+        def flip_frame():
+            frame = now + next(clock) % 60
+            if frame == now:
+                board.animations.start(0, now, 60)
+                board.animations.start(1, now, 60)
+            kiosk.tick(frame)
+
+        results[f'kiosk.boards-{count}.one_board_flipping'] = options.measure(flip_frame)
+        results[f'kiosk.boards-{count}.memory'] = result(memory / 1024, 'KiB')
+
+    pygame.quit()
+
+    return results
@@ -0,0 +1,50 @@
+import pygame
+
+from game_core import MemoryGame
+from memorygame import check_for_match, reset_game
+
+BOARDS = {
+    'easy': (3, 4),
+    'hard': (5, 4),
+    'huge': (40, 25),
+    'grid-200x100': (200, 100),
+}
+
+
+def run(options):
+    """
+    Times check_for_match on a miss and on a match (including the two picks) and reset_game for every board.
+    """
+    pygame.mixer.init()
+    match_sound = pygame.mixer.Sound('match.wav')
+    results = {}
+
+    for name, (cols, rows) in BOARDS.items():
+        game = MemoryGame(cols, rows, seed=options.seed)
+        # A miss leaves the board as it is, so the same two cards can be picked over and over
+        first = 0
+        second = next(i for i in range(1, len(game.board)) if game.board[i] != game.board[first])
+
+        def miss():
+            game.select(first)
+            game.select(second)
+            check_for_match(game, match_sound)
+
+        def solve():
+            game.reset()
+            positions = {}
+            for index, face in enumerate(game.board):
+                positions.setdefault(face, []).append(index)
+            for first, second in positions.values():
+                game.select(first)
+                game.select(second)
+                check_for_match(game, match_sound)
+
+        results[f'logic.{name}.check_for_match_miss'] = options.measure(miss)
+        # Per matched pair, including the share of the reset needed to get a fresh board
+        results[f'logic.{name}.check_for_match_pair'] = options.measure(solve, per_call=len(game.board) // 2)
+        results[f'logic.{name}.reset_game'] = options.measure(lambda: reset_game(game))
+
+    pygame.mixer.quit()
+
+    return results
@@ -0,0 +1,104 @@
+import itertools
+
+import pygame
+
+from animation import TweenBatch
+from board_ui import draw_cards, register_cards
+from board_view import BoardView
+from card_atlas import CardAtlas
+from card_faces import MAX_GENERATED_FACES, generate_faces
+from game_core import MemoryGame
+from renderer import DirtyRenderer
+
+SCREEN_SIZE = (640, 480)
+INFO_BAR_HEIGHT = 100
+HIDDEN_COLOR = (0, 0, 0)
+
+# The difficulties of the game plus larger synthetic grids; the Huge ones only draw the cards in the viewport
+BOARDS = {
+    'easy': (3, 4),
+    'medium': (4, 4),
+    'hard': (5, 4),
+    'huge': (40, 25),
+    'grid-100x80': (100, 80),
+    'grid-200x100': (200, 100),
+}
+
+
+def run(options):
+    """
+    Times drawing the cards and whole frames through the dirty-rect renderer for every board.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    font = pygame.font.SysFont("calibri", 24)
+    results = {}
+
+    for name, (cols, rows) in BOARDS.items():
+        # The 200x100 grid has more pairs than faces can be told apart; its faces repeat, which is all timing needs
+        pairs = cols * rows // 2
+        colors = (generate_faces(min(pairs, MAX_GENERATED_FACES)) * -(-pairs // MAX_GENERATED_FACES))[:pairs]
+        game = MemoryGame(cols, rows, colors, seed=options.seed)
+        view = BoardView(cols, rows, (0, INFO_BAR_HEIGHT, SCREEN_SIZE[0], SCREEN_SIZE[1] - INFO_BAR_HEIGHT))
+        atlas = CardAtlas(view.card_width, view.card_height, colors + [HIDDEN_COLOR])
+        idle = TweenBatch()
+        renderer = DirtyRenderer(screen, (255, 255, 255))
+
+        results[f'render.{name}.draw_cards'] = options.measure(
+            lambda: draw_cards(screen, game, view, HIDDEN_COLOR, idle, font))
+        results[f'render.{name}.draw_cards_atlas'] = options.measure(
+            lambda: draw_cards(screen, game, view, HIDDEN_COLOR, idle, font, atlas))
+
+        def full_frame():
+            renderer.invalidate()
+            register_cards(renderer, game, view, HIDDEN_COLOR, idle, font, atlas)
+            renderer.present()
+
+        def steady_frame():
+            register_cards(renderer, game, view, HIDDEN_COLOR, idle, font, atlas)
+            renderer.present()
+
+        # Two cards mid-flip, as while a pair is being revealed; the clock wraps so they never finish
+        flips = TweenBatch()
+        clock = itertools.count()
+
+        def flip_frame():
+            now = next(clock) % 60
+            if now == 0:
+                flips.start(0, 0, 60)
+                flips.start(1, 0, 60)
+            flips.update(now)
+            register_cards(renderer, game, view, HIDDEN_COLOR, flips, font, atlas)
+            renderer.present()
+
+        results[f'render.{name}.full_frame'] = options.measure(full_frame)
+        results[f'render.{name}.steady_frame'] = options.measure(steady_frame)
+        results[f'render.{name}.flip_frame'] = options.measure(flip_frame)
+
+        # One zoom notch: the atlas is resized to the next card size and the viewport drawn from it
+        zoom_atlas = CardAtlas(view.card_width, view.card_height, colors + [HIDDEN_COLOR])
+        sizes = itertools.cycle((view.card_width + 1, view.card_width))
+
+        def zoom_step():
+            size = next(sizes)
+            zoom_atlas.resize(size, size * view.card_height // view.card_width)
+            draw_cards(screen, game, view, HIDDEN_COLOR, idle, font, zoom_atlas)
+
+        results[f'render.{name}.zoom_step'] = options.measure(zoom_step)
+
+        # Scrolling by a card with the board zoomed all the way out, where the most cards are on screen
+        view.zoom_at(view.min_zoom / view.zoom, view.viewport.topleft)
+        atlas.resize(view.card_width, view.card_height)
+        steps = itertools.cycle((1, -1))
+
+        def zoomed_out_scroll_frame():
+            view.scroll(next(steps) * view.card_width, 0)
+            register_cards(renderer, game, view, HIDDEN_COLOR, idle, font, atlas)
+            renderer.present()
+
+        results[f'render.{name}.zoomed_out_scroll_frame'] = options.measure(zoomed_out_scroll_frame)
+
+    pygame.quit()
+
+    return results
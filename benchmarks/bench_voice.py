@@ -0,0 +1,124 @@
+import os
+import re
+import statistics
+import time
+import wave
+
+from timing import result
+from voice_engine import voice_engine
+from voice_pipeline import VOICE_BLOCK_FRAMES, VoicePipeline, parse_card_number, voice_grammar
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+TRAILING_SILENCE = 1.0  # Seconds of silence appended to each recording so the speech gate closes
+
+
+def load_fixtures(directory):
+    """
+    Returns (name, expected number, 16-bit mono PCM) for every WAV file in directory. The card number
+    spoken in a recording is the number its file name starts with, e.g. 07.wav or 12_noisy_room.wav.
+    """
+    fixtures = []
+
+    for file_name in sorted(os.listdir(directory)):
+        match = re.match(r'(\d+)', file_name)
+        if not file_name.lower().endswith('.wav') or match is None:
+            continue
+
+        with wave.open(os.path.join(directory, file_name), 'rb') as recording:
+            if (recording.getnchannels(), recording.getsampwidth(), recording.getframerate()) != \
+                    (1, 2, voice_engine.sample_rate):
+                print(f"Skipping {file_name}: voice fixtures must be 16-bit mono at {voice_engine.sample_rate} Hz")
+                continue
+            fixtures.append((file_name, int(match.group(1)), recording.readframes(recording.getnframes())))
+
+    return fixtures
+
+
+def play_fixture(pipeline, audio):
+    """
+    Feeds a recording through the pipeline in the blocks the microphone callback delivers and returns the
+    (command, latency) pairs. Blocks are fed as fast as possible, but on a simulated clock: a block cannot be
+    processed before it would have been captured, and processing takes the CPU time it actually took, so the
+    latency is what a live microphone would have seen without waiting in real time.
+    """
+    block_bytes = VOICE_BLOCK_FRAMES * 2
+    block_seconds = VOICE_BLOCK_FRAMES / voice_engine.sample_rate
+    audio += bytes(int(TRAILING_SILENCE * voice_engine.sample_rate) * 2)
+    clock = 0.0
+    commands = []
+
+    for block_index, offset in enumerate(range(0, len(audio) - block_bytes + 1, block_bytes)):
+        captured = (block_index + 1) * block_seconds
+        clock = max(clock, captured)
+        started = time.perf_counter()
+        found = pipeline.process(audio[offset:offset + block_bytes], captured)
+        clock += time.perf_counter() - started
+
+        commands.extend((command, clock - speech_end) for command, speech_end in found)
+
+    return commands
+
+
+def skip(options, reason):
+    """
+    Skips the voice benchmarks when every suite runs, but stops the run when they were asked for by name, so
+    a missing model or fixture set cannot pass for an empty result.
+    """
+    if 'voice' in options.suites:
+        raise SystemExit(f"Cannot run the voice benchmarks: {reason}")
+    print(f"Skipping voice benchmarks: {reason}")
+
+    return {}
+
+
+def run(options):
+    """
+    Measures end-of-speech to command latency and accuracy on the recorded fixtures, through the same
+    grammar recognizer and VoicePipeline the voice thread uses.
+    """
+    if not os.path.isdir(options.fixtures):
+        return skip(options, f"no fixture directory {options.fixtures}")
+
+    fixtures = load_fixtures(options.fixtures)
+    if not fixtures:
+        return skip(options, f"no 16-bit mono WAV fixtures in {options.fixtures}")
+
+    if not voice_engine.wait_ready():
+        return skip(options, voice_engine.error)
+
+    max_number = max(20, max(expected for _, expected, _ in fixtures))
+    grammar = voice_grammar(max_number)
+    recognizer = voice_engine.acquire_recognizer(grammar)
+    latencies = []
+    correct = 0
+    audio_seconds = 0.0
+    recognizer_cpu = 0.0
+
+    try:
+        for name, expected, audio in fixtures:
+            pipeline = VoicePipeline(recognizer, max_number=max_number)
+            commands = play_fixture(pipeline, audio)
+            recognized = [(parse_card_number(command), latency) for command, latency in commands]
+
+            if recognized and recognized[0][0] == expected:
+                correct += 1
+                latencies.append(recognized[0][1])
+            else:
+                print(f"{name}: expected {expected}, heard {[command for command, _ in commands]}")
+
+            audio_seconds += pipeline.frames_seen / voice_engine.sample_rate
+            recognizer_cpu += pipeline.recognizer_cpu_time
+            recognizer.Reset()
+    finally:
+        voice_engine.release_recognizer(recognizer, grammar)
+
+    results = {
+        'voice.accuracy': result(correct / len(fixtures) * 100, '%', better='higher', fixtures=len(fixtures)),
+        'voice.recognizer_cpu_per_audio_second': result(recognizer_cpu / audio_seconds * 1000, 'ms'),
+    }
+    if latencies:
+        ordered = sorted(latencies)
+        results['voice.latency_median'] = result(statistics.median(ordered) * 1000, 'ms')
+        results['voice.latency_p90'] = result(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))] * 1000, 'ms')
+
+    return results
@@ -0,0 +1,128 @@
+"""
+Benchmarks for rendering, game logic, voice recognition and the multi-board kiosk. Runs headless on SDL's
+dummy video and audio drivers, writes the results to a JSON file and can compare them with an earlier run:
+
+    python benchmarks/run_benchmarks.py --out results.json
+    python benchmarks/run_benchmarks.py --out new.json --compare results.json
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)  # match.wav and the voice model are looked up relative to the game's folder
+
+import pygame  # noqa: E402
+
+import bench_kiosk  # noqa: E402
+import bench_logic  # noqa: E402
+import bench_render  # noqa: E402
+import bench_voice  # noqa: E402
+from timing import measure  # noqa: E402
+
+SUITES = {
+    'render': bench_render.run,
+    'logic': bench_logic.run,
+    'voice': bench_voice.run,
+    'kiosk': bench_kiosk.run,
+}
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints every result next to its baseline and returns the names of the ones that got worse by more than
+    threshold (a fraction).
+    """
+    regressions = []
+
+    for name, entry in results.items():
+        base = baseline.get(name)
+        if base is None or base['unit'] != entry['unit'] or not base['value']:
+            print(f"{name:<50} {entry['value']:>12.3f} {entry['unit']:<3} (new)")
+            continue
+
+        change = entry['value'] / base['value'] - 1
+        worse = change > threshold if entry['better'] == 'lower' else change < -threshold
+        if worse:
+            regressions.append(name)
+        print(f"{name:<50} {entry['value']:>12.3f} {entry['unit']:<3} {change:>+8.1%}"
+              f"{'  REGRESSION' if worse else ''}")
+
+    for name in sorted(baseline.keys() - results.keys()):
+        print(f"{name:<50} {'':>12} {'':<3} (missing)")
+
+    return regressions
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Memory Game benchmarks')
+    parser.add_argument('suites', nargs='*', metavar='SUITE', help=f"suites to run: {', '.join(SUITES)} (default all)")
+    parser.add_argument('--out', metavar='PATH', help='write the results to PATH as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='compare the results with an earlier results file')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='fraction a result may get worse before it counts as a regression (default 0.10)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repeats per benchmark; the median is kept')
+    parser.add_argument('--seed', type=int, default=1, help='board shuffle seed')
+    parser.add_argument('--fixtures', default=bench_voice.FIXTURES_DIR,
+                        help='directory of WAV recordings for the voice benchmarks')
+
+    options = parser.parse_args(argv)
+    unknown = [suite for suite in options.suites if suite not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    return options
+
+
+def main(argv=None):
+    options = parse_arguments(sys.argv[1:] if argv is None else argv)
+    options.measure = functools.partial(measure, repeat=options.repeat)
+    results = {}
+
+    suites = options.suites or list(SUITES)
+
+    for suite in suites:
+        started = time.perf_counter()
+        results.update(SUITES[suite](options))
+        print(f"{suite}: {time.perf_counter() - started:.1f}s")
+
+    if options.out:
+        with open(options.out, 'w') as results_file:
+            json.dump({
+                'meta': {
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python': platform.python_version(),
+                    'pygame': pygame.version.ver,
+                    'platform': platform.platform(),
+                    'machine': platform.machine(),
+                },
+                'results': results,
+            }, results_file, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        # Results are named after their suite, so a partial run is only compared with the suites it ran
+        baseline = {name: entry for name, entry in baseline.items() if name.split('.')[0] in suites}
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {options.threshold:.0%}")
+            return 1
+    else:
+        for name, entry in results.items():
+            print(f"{name:<50} {entry['value']:>12.3f} {entry['unit']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
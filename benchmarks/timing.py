@@ -0,0 +1,26 @@
+import statistics
+import timeit
+
+UNIT_SCALES = {'s': 1.0, 'ms': 1e3, 'us': 1e6}
+
+
+def result(value, unit, better='lower', **extra):
+    """
+    Returns one benchmark result entry as stored in the results file.
+    """
+    entry = {'value': round(value, 3), 'unit': unit, 'better': better}
+    entry.update(extra)
+
+    return entry
+
+
+def measure(func, repeat=5, unit='us', per_call=1):
+    """
+    Times func with timeit: the number of calls per repeat is picked so a repeat takes at least 0.2 s.
+    Returns the median time per call (divided by per_call, for functions that do several operations).
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [total / number / per_call * UNIT_SCALES[unit] for total in timer.repeat(repeat, number)]
+
+    return result(statistics.median(times), unit, min=round(min(times), 3), calls=number * repeat)
@@ -0,0 +1,133 @@
+import argparse
+import functools
+
+import pygame
+
+from card_faces import MAX_GENERATED_FACES, draw_face, generate_faces
+from text_cache import text_cache
+
+# Board drawing shared by the memorygame and kiosk front ends; unlike either script, importing it has no side effects
+
+# Hand-picked card colors; boards with more pairs get faces with glyphs from generate_faces() instead
+CARD_COLORS = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
+    (255, 0, 255), (0, 255, 255), (128, 0, 0), (0, 128, 0),
+    (0, 0, 128), (128, 128, 0), (128, 0, 128), (0, 128, 128),
+    (192, 192, 192), (128, 128, 128), (64, 0, 0), (0, 64, 0),
+    (0, 0, 64), (64, 64, 0), (64, 0, 64), (0, 64, 64)
+]
+
+# Zoomed out further, numbers are unreadable and there are more of them on screen than text_cache holds
+MIN_LABEL_CARD_SIZE = 32
+
+
+def board_faces(pairs):
+    """
+    Returns the faces of a board with the given number of pairs: the hand-picked colors, or generated faces
+    with glyphs for boards with more pairs than those (the dark hand-picked colors are too close to the back).
+    """
+    if pairs > MAX_GENERATED_FACES:
+        raise ValueError(f"{pairs} pairs is more than the {MAX_GENERATED_FACES} faces that can be told apart")
+
+    return CARD_COLORS[:pairs] if pairs <= len(CARD_COLORS) else generate_faces(pairs)
+
+
+def card_appearance(index, game, view, hidden_color, card_animations):
+    """
+    Returns the rect, face (the hidden color while face down) and whether the number is shown for a single card.
+    Numbers are left off cards smaller than MIN_LABEL_CARD_SIZE.
+    """
+    rect = view.card_rect(index)
+    progress = card_animations.progress(index)
+
+    if progress is not None:
+        width = rect.width * (1 - abs(progress - 0.5) * 2)
+        rect = pygame.Rect(rect.x + (rect.width - width) / 2, rect.y, width, rect.height)
+        face = game.face(index) if progress >= 0.5 else hidden_color  # Switch to card's face at the halfway point
+    else:
+        face = game.face(index) if game.matched[index] or index in game.selected else hidden_color
+
+    return rect, face, not game.matched[index] and min(view.card_width, view.card_height) >= MIN_LABEL_CARD_SIZE
+
+
+def draw_card(screen, rect, face, number, font, atlas=None):
+    """
+    Draws a single card and, if given, its number centered on it. With an atlas the card is blitted from
+    its pre-rendered sprites.
+    """
+    if atlas is not None:
+        atlas.draw(screen, rect, face)
+    else:
+        draw_face(screen, rect, face)
+
+    if number is not None:
+        number_text = text_cache.render(font, number, (255, 255, 255))
+        text_rect = number_text.get_rect(center=rect.center)
+        screen.blit(number_text, text_rect)
+
+
+def draw_cards(screen, game, view, hidden_color, card_animations, font, atlas=None):
+    """
+    Draws the cards inside the view's viewport, now accounting for animation states.
+    """
+    for index in view.visible_indices():
+        rect, face, show_number = card_appearance(index, game, view, hidden_color, card_animations)
+        # Only cards that are not matched get their number drawn
+        draw_card(screen, rect, face, str(index + 1) if show_number else None, font, atlas)
+
+
+def register_cards(renderer, game, view, hidden_color, card_animations, font, atlas=None):
+    """
+    Registers the cards inside the view's viewport with the renderer; only the cards whose appearance
+    changed get repainted when it presents the frame.
+    """
+    for index in view.visible_indices():
+        rect, face, show_number = card_appearance(index, game, view, hidden_color, card_animations)
+        number = str(index + 1) if show_number else None
+        renderer.region(('card', index), rect, (face, number),
+                        functools.partial(draw_card, face=face, number=number, font=font, atlas=atlas))
+
+
+def display_text(screen, text, font, color, position):
+    """
+    Renders text on the screen at the specified position.
+    """
+    text_surface = text_cache.render(font, text, color)
+    screen.blit(text_surface, position)
+
+
+def game_over_message_box(message, font, screen_width, screen_height):
+    """
+    Returns the rect of the box the game over message is shown in.
+    """
+    message_box_width = max(200, font.size(message)[0] + 20)
+    message_box_height = 100
+    message_box_x = (screen_width - message_box_width) // 2
+    message_box_y = (screen_height - message_box_height) // 2
+
+    return pygame.Rect(message_box_x, message_box_y, message_box_width, message_box_height)
+
+
+def display_game_over_message(screen, message, font, text_color, screen_width, screen_height):
+    game_over_surface = text_cache.render(font, message, text_color)
+    message_box = game_over_message_box(message, font, screen_width, screen_height)
+
+    pygame.draw.rect(screen, (100, 100, 100), message_box)
+    game_over_x = message_box.x + (message_box.width - game_over_surface.get_width()) // 2
+    game_over_y = message_box.y + (message_box.height - game_over_surface.get_height()) // 2
+    screen.blit(game_over_surface, (game_over_x, game_over_y))
+
+
+def board_size(text):
+    """
+    Parses a COLSxROWS board size for argparse; the board needs an even number of cards.
+    """
+    try:
+        cols, rows = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected COLSxROWS, got {text!r}")
+
+    if cols < 1 or rows < 1 or cols * rows % 2:
+        raise argparse.ArgumentTypeError(f"{text} is not a board with an even number of cards")
+
+    return cols, rows
@@ -0,0 +1,97 @@
+import pygame
+
+
+class BoardView:
+    """
+    Maps a cols x rows board onto a scrollable, zoomable viewport. Only the cards inside the viewport are
+    visited when drawing, and hit-testing a click is a division rather than a search, so frame time does not
+    grow with the size of the board.
+    """
+
+    def __init__(self, cols, rows, viewport, min_card_size=48, max_zoom=4.0):
+        self.cols = cols
+        self.rows = rows
+        self.viewport = pygame.Rect(viewport)
+        # At zoom 1 cards fill the viewport, as on the regular boards, but never get smaller than min_card_size
+        self.base_width = max(self.viewport.width // cols, min_card_size)
+        self.base_height = max(self.viewport.height // rows, min_card_size)
+        # Zooming out stops once the whole board fits or cards reach half of min_card_size, which bounds the cards
+        # on screen (and so the frame time) to about four times as many as at zoom 1
+        fit = min(self.viewport.width / (cols * self.base_width), self.viewport.height / (rows * self.base_height))
+        self.min_zoom = min(1.0, max(fit, min_card_size / 2 / min(self.base_width, self.base_height)))
+        self.max_zoom = max_zoom if self.base_width * cols > self.viewport.width or \
+            self.base_height * rows > self.viewport.height else 1.0
+        self.zoom = 1.0
+        self.card_width = self.base_width
+        self.card_height = self.base_height
+        self.offset_x = 0
+        self.offset_y = 0
+
+    @property
+    def scrollable(self):
+        return (self.cols * self.card_width > self.viewport.width
+                or self.rows * self.card_height > self.viewport.height)
+
+    def card_rect(self, index):
+        """
+        Returns the on-screen rect of the card at index (it may lie outside the viewport).
+        """
+        row, col = divmod(index, self.cols)
+
+        return pygame.Rect(self.viewport.x + col * self.card_width - self.offset_x,
+                           self.viewport.y + row * self.card_height - self.offset_y,
+                           self.card_width, self.card_height)
+
+    def visible_indices(self):
+        """
+        Returns the indices of the cards that are at least partly inside the viewport, row by row.
+        """
+        card_width, card_height = self.card_width, self.card_height
+        first_col = self.offset_x // card_width
+        last_col = min(self.cols, (self.offset_x + self.viewport.width - 1) // card_width + 1)
+        first_row = self.offset_y // card_height
+        last_row = min(self.rows, (self.offset_y + self.viewport.height - 1) // card_height + 1)
+
+        return [row * self.cols + col for row in range(first_row, last_row) for col in range(first_col, last_col)]
+
+    def hit_test(self, pos):
+        """
+        Returns the index of the card under pos, or None.
+        """
+        if not self.viewport.collidepoint(pos):
+            return None
+
+        col = (pos[0] - self.viewport.x + self.offset_x) // self.card_width
+        row = (pos[1] - self.viewport.y + self.offset_y) // self.card_height
+
+        if col >= self.cols or row >= self.rows:
+            return None
+
+        return row * self.cols + col
+
+    def scroll(self, dx, dy):
+        self.offset_x += dx
+        self.offset_y += dy
+        self._clamp()
+
+    def zoom_at(self, factor, anchor):
+        """
+        Zooms by factor, keeping the point of the board under anchor (a screen position) in place.
+        """
+        zoom = min(self.max_zoom, max(self.min_zoom, self.zoom * factor))
+        if zoom == self.zoom:
+            return
+
+        anchor_x = anchor[0] - self.viewport.x + self.offset_x
+        anchor_y = anchor[1] - self.viewport.y + self.offset_y
+        scale = zoom / self.zoom
+        self.zoom = zoom
+        self.card_width = max(1, int(self.base_width * zoom))
+        self.card_height = max(1, int(self.base_height * zoom))
+        self.offset_x = int(anchor_x * scale) - (anchor[0] - self.viewport.x)
+        self.offset_y = int(anchor_y * scale) - (anchor[1] - self.viewport.y)
+        self._clamp()
+
+    def _clamp(self):
+        self.offset_x = max(0, min(self.offset_x, self.cols * self.card_width - self.viewport.width))
+        self.offset_y = max(0, min(self.offset_y, self.rows * self.card_height - self.viewport.height))
@@ -0,0 +1,107 @@
+import pygame
+
+from card_faces import BORDER_COLOR, BORDER_WIDTH, draw_face, face_color
+
+ATLAS_MAX_WIDTH = 2048
+ATLAS_MAX_PIXELS = 1 << 20  # Face slots kept at one card size; far more than the viewport can show at once
+
+
+class CardAtlas:
+    """
+    Keeps card faces (including the hidden back), with their glyph and border, and a fixed set of flip-animation border
+    frames in one converted surface, so drawing a card is a blit instead of drawing its shapes.
+    Faces are rendered into the atlas the first time they are drawn, so resizing it when the card size changes
+    (every zoom step) only costs the border frames, and the surface never grows past ATLAS_MAX_PIXELS. Once
+    its face slots are used up they are handed out again from the first one.
+    """
+
+    def __init__(self, card_width, card_height, faces, flip_frames=16):
+        self.faces = list(dict.fromkeys(faces))  # Faces plus the hidden color, without duplicates
+        self.flip_frames = flip_frames
+        self.card_width = 0
+        self.card_height = 0
+        self.surface = None
+        self.capacity = 0  # Face slots in the surface
+        self._known = set(self.faces)
+        self._faces = {}  # face -> source rect of the full card, for the faces rendered so far
+        self._frames = []  # source rects of the flip border frames, narrowest first
+        self._per_row = 1
+        self.builds = 0
+        self.faces_rendered = 0
+        self.resize(card_width, card_height)
+
+    def resize(self, card_width, card_height):
+        """
+        Rebuilds the atlas for a new card size. Returns False if the size did not change.
+        """
+        if (card_width, card_height) == (self.card_width, self.card_height):
+            return False
+
+        self.card_width = card_width
+        self.card_height = card_height
+        self._build()
+
+        return True
+
+    def _build(self):
+        card_width, card_height = self.card_width, self.card_height
+        self._per_row = max(1, ATLAS_MAX_WIDTH // card_width)
+        self.capacity = min(len(self.faces), max(1, ATLAS_MAX_PIXELS // (card_width * card_height)))
+        face_rows = -(-self.capacity // self._per_row)
+        frame_widths = [round(card_width * frame / (self.flip_frames - 1)) for frame in range(self.flip_frames)]
+        atlas_width = max(min(self.capacity, self._per_row) * card_width, sum(frame_widths))
+
+        surface = pygame.Surface((atlas_width, (face_rows + 1) * card_height))
+        # Flip frames are borders only; their interior is keyed out so the card color can be filled underneath
+        used = {face_color(face) for face in self.faces}
+        colorkey = next(color for color in ((255, 0, 254), (1, 2, 3), (254, 1, 255)) if color not in used)
+        surface.fill(colorkey)
+
+        self._frames = []
+        x = 0
+        for width in frame_widths:
+            rect = pygame.Rect(x, face_rows * card_height, width, card_height)
+            if width:
+                pygame.draw.rect(surface, BORDER_COLOR, rect, BORDER_WIDTH)
+            self._frames.append(rect)
+            x += width
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()  # Match the display format so blits need no conversion
+        surface.set_colorkey(colorkey)
+        self.surface = surface
+        self._faces = {}
+        self.builds += 1
+
+    def _render_face(self, face):
+        """
+        Renders a face into the next free slot and returns its source rect.
+        """
+        if len(self._faces) == self.capacity:
+            self._faces.clear()  # Start over; faces that are still shown are rendered again when drawn
+
+        row, col = divmod(len(self._faces), self._per_row)
+        rect = pygame.Rect(col * self.card_width, row * self.card_height, self.card_width, self.card_height)
+        draw_face(self.surface, rect, face)
+        self._faces[face] = rect
+        self.faces_rendered += 1
+
+        return rect
+
+    def draw(self, screen, rect, face):
+        """
+        Draws a card with the given face into rect: a single blit for a full card, or a fill of its color plus
+        the nearest pre-rendered border frame for a card that is mid-flip.
+        """
+        if rect.width == self.card_width and rect.height == self.card_height and face in self._known:
+            screen.blit(self.surface, rect, self._faces.get(face) or self._render_face(face))
+            return
+
+        frame = self._frames[min(self.flip_frames - 1, round(rect.width / self.card_width * (self.flip_frames - 1)))]
+        if not frame.width:
+            return
+
+        target = pygame.Rect(0, rect.y, frame.width, self.card_height)
+        target.centerx = rect.centerx
+        screen.fill(face_color(face), target)
+        screen.blit(self.surface, target, frame)
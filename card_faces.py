@@ -0,0 +1,120 @@
+import colorsys
+from collections import namedtuple
+
+import pygame
+
+BORDER_COLOR = (0, 0, 0)
+BORDER_WIDTH = 3
+MIN_COLOR_DISTANCE = 120  # "Redmean" distance between any two palette colors; about 765 from black to white
+SHAPES = ('circle', 'square', 'diamond', 'triangle', 'hexagon', 'plus', 'cross', 'bar')
+
+# A generated card face: a palette color with a glyph on it, an outlined shape around a filled one. Only a few
+# dozen colors are told apart at a glance, so the glyph tells apart the faces of boards with hundreds of pairs.
+Face = namedtuple('Face', ['color', 'outer', 'inner'])
+
+
+def color_distance(first, second):
+    """
+    Returns the "redmean" distance between two RGB colors, a cheap approximation of how different they look.
+    """
+    mean_red = (first[0] + second[0]) / 2
+    red, green, blue = (a - b for a, b in zip(first, second))
+
+    return ((2 + mean_red / 256) * red * red + 4 * green * green + (2 + (255 - mean_red) / 256) * blue * blue) ** 0.5
+
+
+def distinct_palette(min_distance=MIN_COLOR_DISTANCE):
+    """
+    Returns the colors of 24 hues at a few saturation/brightness levels that are at least min_distance away
+    from each other and from the hidden card color and the background, in the order they were picked.
+    """
+    palette = []
+    taken = [(0, 0, 0), (255, 255, 255)]
+
+    for saturation, value in ((1.0, 1.0), (1.0, 0.6), (0.45, 1.0), (0.6, 0.8), (1.0, 0.35)):
+        for hue in range(24):
+            color = tuple(round(channel * 255) for channel in colorsys.hsv_to_rgb(hue / 24, saturation, value))
+            if all(color_distance(color, other) >= min_distance for other in taken):
+                palette.append(color)
+                taken.append(color)
+
+    return palette
+
+
+PALETTE = distinct_palette()
+MAX_GENERATED_FACES = len(PALETTE) * len(SHAPES) ** 2
+
+
+def generate_faces(count):
+    """
+    Returns count distinct card faces for boards with more pairs than the hand-picked colors. The color changes
+    fastest, so faces that differ only in their glyph are rare on boards of a few hundred pairs.
+    """
+    if count > MAX_GENERATED_FACES:
+        raise ValueError(f"cannot generate {count} distinguishable faces, at most {MAX_GENERATED_FACES}")
+
+    faces = []
+    for number in range(count):
+        glyph, color = divmod(number, len(PALETTE))
+        outer, inner = divmod(glyph, len(SHAPES))
+        faces.append(Face(PALETTE[color], SHAPES[outer], SHAPES[inner]))
+
+    return faces
+
+
+def face_color(face):
+    """
+    Returns the fill color of a face: a generated Face or a plain RGB color.
+    """
+    return face.color if isinstance(face, Face) else face
+
+
+def draw_shape(surface, color, shape, box, width=0):
+    """
+    Draws a shape into the square box; filled, or outlined width pixels wide.
+    """
+    left, top, size = box.x, box.y, box.width
+    middle = size / 2
+
+    if shape == 'circle':
+        pygame.draw.ellipse(surface, color, box, width)
+    elif shape == 'square':
+        pygame.draw.rect(surface, color, box.inflate(-size // 6, -size // 6), width)
+    elif shape == 'bar':
+        pygame.draw.rect(surface, color, (left, top + size // 3, size, size - 2 * (size // 3)), width)
+    elif shape in ('plus', 'cross'):
+        thickness = max(1, width or size // 4)
+        ends = (((0, middle), (size, middle)), ((middle, 0), (middle, size))) if shape == 'plus' else \
+            (((0, 0), (size, size)), ((0, size), (size, 0)))
+        for start, end in ends:
+            pygame.draw.line(surface, color, (left + start[0], top + start[1]), (left + end[0], top + end[1]),
+                             thickness)
+    else:
+        points = {
+            'diamond': ((middle, 0), (size, middle), (middle, size), (0, middle)),
+            'triangle': ((middle, 0), (size, size), (0, size)),
+            'hexagon': ((size / 4, 0), (size * 3 / 4, 0), (size, middle), (size * 3 / 4, size), (size / 4, size),
+                        (0, middle)),
+        }[shape]
+        pygame.draw.polygon(surface, color, [(left + x, top + y) for x, y in points], width)
+
+
+def draw_face(surface, rect, face):
+    """
+    Draws a full card: its fill, the glyph of a generated face, and the border.
+    """
+    color = face_color(face)
+    pygame.draw.rect(surface, color, rect)
+
+    size = min(rect.width, rect.height) - 2 * BORDER_WIDTH
+    if isinstance(face, Face) and size >= 8:  # Cards narrower than that (mid-flip, zoomed far out) show the color
+        # Dark glyphs on light colors and light ones on dark colors
+        ink = (0, 0, 0) if 0.299 * color[0] + 0.587 * color[1] + 0.114 * color[2] > 140 else (255, 255, 255)
+        outer = pygame.Rect(0, 0, size * 3 // 4, size * 3 // 4)
+        outer.center = rect.center
+        inner = pygame.Rect(0, 0, size * 5 // 16, size * 5 // 16)
+        inner.center = rect.center
+        draw_shape(surface, ink, face.outer, outer, max(1, size // 12))
+        draw_shape(surface, ink, face.inner, inner)
+
+    pygame.draw.rect(surface, BORDER_COLOR, rect, BORDER_WIDTH)
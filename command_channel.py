@@ -0,0 +1,75 @@
+import time
+from collections import deque, namedtuple
+
+# A validated request to turn over the card at index (0-based); timestamp is when the command was spoken
+SelectCard = namedtuple('SelectCard', ['index', 'timestamp'])
+
+DROP_OLDEST = 'oldest'
+DROP_NEWEST = 'newest'
+
+
+class CommandChannel:
+    """
+    Bounded single-producer/single-consumer channel between the voice thread and the game loop.
+    It relies on deque.append and deque.popleft being atomic in CPython, so neither side takes a lock.
+    The producer coalesces repeats of the same command within coalesce_window seconds, and when the channel
+    is full either the oldest pending command or the new one is dropped.
+    """
+
+    def __init__(self, capacity=4, drop_policy=DROP_OLDEST, coalesce_window=1.0):
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.capacity = capacity
+        self.drop_policy = drop_policy
+        self.coalesce_window = coalesce_window
+        # With maxlen, a full deque discards its oldest item on append
+        self._queue = deque(maxlen=capacity if drop_policy == DROP_OLDEST else None)
+        self._last_put = None  # Producer-side only: (action, time) of the last accepted command
+
+        self.accepted = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def put(self, action):
+        """
+        Producer side: queues action. Returns False if it was coalesced or dropped.
+        """
+        now = time.perf_counter()
+
+        if (self._last_put is not None and self._last_put[0] == action.index
+                and now - self._last_put[1] < self.coalesce_window):
+            self.coalesced += 1
+            return False
+
+        if len(self._queue) >= self.capacity:
+            self.dropped += 1
+            if self.drop_policy == DROP_NEWEST:
+                return False
+
+        self._queue.append(action)
+        self._last_put = (action.index, now)
+        self.accepted += 1
+
+        return True
+
+    def drain(self, limit=None):
+        """
+        Consumer side: removes and returns up to limit pending commands, oldest first.
+        """
+        actions = []
+
+        while self._queue and (limit is None or len(actions) < limit):
+            actions.append(self._queue.popleft())
+
+        return actions
+
+    def clear(self):
+        self._queue.clear()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def stats(self):
+        return {'accepted': self.accepted, 'coalesced': self.coalesced, 'dropped': self.dropped,
+                'pending': len(self._queue)}
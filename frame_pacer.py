@@ -0,0 +1,71 @@
+import time
+
+import pygame
+
+
+class FramePacer:
+    """
+    Ends each frame of the main loop. While something is moving (animations, pending deferred actions, queued
+    voice commands) it keeps the capped frame rate; otherwise it blocks in pygame.event.wait until an event
+    arrives or the next known deadline (timer second, scheduled action) is reached.
+    Keeps totals of time spent rendering, sleeping for the frame cap and blocked while idle.
+    """
+
+    def __init__(self, fps=60, max_idle_wait=1000):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.max_idle_wait = max_idle_wait  # Milliseconds to block at most, even with no deadline
+        self._woken_by = []
+        self._frame_started = time.perf_counter()
+
+        self.busy_frames = 0
+        self.idle_frames = 0
+        self.render_time = 0.0
+        self.cap_wait_time = 0.0
+        self.idle_wait_time = 0.0
+
+    def events(self):
+        """
+        Returns the events for this frame, including the one that woke an idle wait.
+        """
+        events, self._woken_by = self._woken_by + pygame.event.get(), []
+
+        return events
+
+    def pace(self, busy, wake_at=None):
+        """
+        Ends the frame. busy keeps the full frame rate; otherwise waits for an event or until wake_at
+        (in pygame.time.get_ticks() milliseconds).
+        """
+        frame_ended = time.perf_counter()
+        self.render_time += frame_ended - self._frame_started
+
+        if busy:
+            self.clock.tick(self.fps)
+            self.busy_frames += 1
+            self.cap_wait_time += time.perf_counter() - frame_ended
+        else:
+            timeout = self.max_idle_wait
+            if wake_at is not None:
+                timeout = max(0, min(timeout, int(wake_at - pygame.time.get_ticks())))
+
+            if timeout > 0:
+                event = pygame.event.wait(timeout)
+                if event.type != pygame.NOEVENT:
+                    self._woken_by.append(event)
+
+            self.clock.tick()  # Keep the clock's frame timing current for the next busy frame
+            self.idle_frames += 1
+            self.idle_wait_time += time.perf_counter() - frame_ended
+
+        self._frame_started = time.perf_counter()
+
+    def report(self):
+        """
+        Returns a one-line summary of busy/idle frames and where the loop's time went.
+        """
+        total = self.render_time + self.cap_wait_time + self.idle_wait_time or 1.0
+
+        return (f"{self.busy_frames} busy / {self.idle_frames} idle frames, "
+                f"rendering {self.render_time / total:.1%}, frame cap {self.cap_wait_time / total:.1%}, "
+                f"idle {self.idle_wait_time / total:.1%}")
@@ -0,0 +1,108 @@
+import csv
+import json
+import time
+from collections import deque
+
+
+class FrameProfiler:
+    """
+    Low-overhead per-frame instrumentation for the main loop. The loop calls mark(stage) after each part of
+    the frame; the time since the previous mark is charged to that stage. end_frame() closes the sample,
+    keeps it in a rolling window for the overlay and optionally streams it to a JSON Lines or CSV file.
+    """
+
+    def __init__(self, window=300, export_path=None):
+        self.samples = deque(maxlen=window)  # (work ms, {stage: ms}) of recent frames
+        self.frame = 0
+        self._started = time.perf_counter()
+        self._frame_started = self._started
+        self._last_mark = self._started
+        self._stages = {}
+        self._export_file = None
+        self._csv_writer = None
+        self._export_csv = False
+
+        if export_path is not None:
+            self._export_file = open(export_path, 'w', newline='')
+            self._export_csv = export_path.lower().endswith('.csv')
+
+    def mark(self, stage):
+        """
+        Charges the time since the previous mark (or the start of the frame) to stage.
+        """
+        now = time.perf_counter()
+        self._stages[stage] = self._stages.get(stage, 0.0) + (now - self._last_mark) * 1000
+        self._last_mark = now
+
+    def end_frame(self, idle_stages=('wait',)):
+        """
+        Closes the current frame. Stages named in idle_stages count towards the frame time but not towards
+        the work time shown by the overlay.
+        """
+        now = time.perf_counter()
+        stages, self._stages = self._stages, {}
+        frame_ms = (now - self._frame_started) * 1000
+        work_ms = frame_ms - sum(stages.get(stage, 0.0) for stage in idle_stages)
+        self.samples.append((work_ms, stages))
+        self.frame += 1
+
+        if self._export_file is not None:
+            self._export(now, frame_ms, work_ms, stages)
+
+        self._frame_started = now
+        self._last_mark = now
+
+    def _export(self, now, frame_ms, work_ms, stages):
+        sample = {'frame': self.frame, 'time': round(now - self._started, 6), 'frame_ms': round(frame_ms, 4),
+                  'work_ms': round(work_ms, 4)}
+        sample.update((stage, round(ms, 4)) for stage, ms in stages.items())
+
+        if not self._export_csv:
+            self._export_file.write(json.dumps(sample) + '\n')
+            return
+
+        if self._csv_writer is None:
+            # Columns come from the first frame; stages that show up later are left out of the CSV
+            self._csv_writer = csv.DictWriter(self._export_file, fieldnames=list(sample), restval=0,
+                                              extrasaction='ignore')
+            self._csv_writer.writeheader()
+        self._csv_writer.writerow(sample)
+
+    def percentiles(self, *quantiles):
+        """
+        Returns the work-time percentiles (in ms) of the frames in the window.
+        """
+        ordered = sorted(work_ms for work_ms, _ in self.samples)
+        if not ordered:
+            return [0.0 for _ in quantiles]
+
+        return [ordered[min(len(ordered) - 1, int(len(ordered) * quantile))] for quantile in quantiles]
+
+    def stage_averages(self):
+        """
+        Returns the average ms per frame of every stage in the window, most expensive first.
+        """
+        totals = {}
+        for _, stages in self.samples:
+            for stage, ms in stages.items():
+                totals[stage] = totals.get(stage, 0.0) + ms
+
+        count = max(1, len(self.samples))
+
+        return sorted(((stage, total / count) for stage, total in totals.items()), key=lambda item: -item[1])
+
+    def overlay_lines(self):
+        """
+        Returns the text lines of the on-screen overlay.
+        """
+        last = self.samples[-1][0] if self.samples else 0.0
+        p50, p95, p99 = self.percentiles(0.5, 0.95, 0.99)
+        lines = [f"frame {last:5.2f} ms", f"p50 {p50:.2f} p95 {p95:.2f} p99 {p99:.2f}"]
+        lines.extend(f"{stage:<8} {ms:6.2f} ms" for stage, ms in self.stage_averages())
+
+        return lines
+
+    def close(self):
+        if self._export_file is not None:
+            self._export_file.close()
+            self._export_file = None
@@ -0,0 +1,122 @@
+import random
+from array import array
+
+
+class MemoryGame:
+    """
+    Headless memory game rules. The board is stored as an array of face ids (an index into faces) and
+    matched cards as a bytearray of flags; nothing here depends on pygame, so the same engine drives the
+    UI, the simulator and anything else that needs to play games.
+    """
+    __slots__ = ('cols', 'rows', 'num_players', 'faces', 'board', 'matched', 'selected', 'scores', 'current_player',
+                 'matched_count', 'turns', 'rng')
+
+    def __init__(self, cols, rows, faces=None, num_players=1, seed=None):
+        pairs = cols * rows // 2
+        self.cols = cols
+        self.rows = rows
+        self.num_players = num_players
+        # Faces are whatever the front end shows for a pair (colors in the UI); default to the pair number
+        self.faces = tuple(faces[:pairs]) if faces is not None else tuple(range(pairs))
+        if len(self.faces) < pairs:
+            raise ValueError(f"{cols}x{rows} board needs {pairs} faces, got {len(self.faces)}")
+
+        self.rng = random.Random(seed)
+        self.board = array('H')
+        self.matched = bytearray()
+        self.selected = []
+        self.scores = {}
+        self.current_player = 1
+        self.matched_count = 0
+        self.turns = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        Shuffles a new board and clears selections, scores and the turn counter.
+        A seed reseeds the shuffle so a board can be reproduced.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+
+        board = list(range(len(self.faces))) * 2
+        self.rng.shuffle(board)
+
+        self.board = array('H', board)
+        self.matched = bytearray(len(board))
+        self.selected = []
+        self.scores = {player: 0 for player in range(1, self.num_players + 1)}
+        self.current_player = 1
+        self.matched_count = 0
+        self.turns = 0
+
+    def __len__(self):
+        return len(self.board)
+
+    def face(self, index):
+        """
+        Returns the face shown by the card at index.
+        """
+        return self.faces[self.board[index]]
+
+    def is_matched(self, index):
+        return self.matched[index] == 1
+
+    def is_selected(self, index):
+        return index in self.selected
+
+    def can_select(self, index):
+        """
+        Returns True if the card at index can be turned over right now.
+        """
+        return (0 <= index < len(self.board) and len(self.selected) < 2 and not self.matched[index]
+                and index not in self.selected)
+
+    def select(self, index):
+        """
+        Turns over the card at index. Returns False if the move is not allowed.
+        """
+        if not self.can_select(index):
+            return False
+
+        self.selected.append(index)
+
+        return True
+
+    @property
+    def pair_selected(self):
+        return len(self.selected) == 2
+
+    def resolve(self):
+        """
+        Checks the two selected cards. On a match they are marked matched and the current player scores;
+        on a miss the turn passes to the next player. Returns True on a match, False on a miss and None if
+        there is no pair to check.
+        """
+        if len(self.selected) != 2:
+            return None
+
+        first, second = self.selected
+        self.selected = []
+        self.turns += 1
+
+        if self.board[first] == self.board[second]:
+            self.matched[first] = self.matched[second] = 1
+            self.matched_count += 2
+            self.scores[self.current_player] += 1
+            return True
+
+        if self.num_players > 1:
+            self.current_player = self.current_player % self.num_players + 1
+
+        return False
+
+    @property
+    def is_complete(self):
+        return self.matched_count == len(self.board)
+
+    def unmatched(self):
+        """
+        Returns the indices of cards that are still on the board.
+        """
+        return [index for index, matched in enumerate(self.matched) if not matched]
@@ -0,0 +1,409 @@
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+
+import pygame
+
+from animation import TweenBatch
+from board_ui import (board_faces, board_size, display_game_over_message, display_text, game_over_message_box,
+                      register_cards)
+from board_view import BoardView
+from card_atlas import CardAtlas
+from card_faces import MAX_GENERATED_FACES
+from command_channel import CommandChannel, SelectCard
+from frame_pacer import FramePacer
+from game_core import MemoryGame
+from renderer import DirtyRenderer
+from scheduler import Scheduler
+from text_cache import text_cache
+from voice_capture import capture_voice
+from voice_engine import voice_engine
+from voice_pipeline import latency_summary, parse_board_command
+
+BG_COLOR = (255, 255, 255)
+BAR_COLOR = (230, 230, 230)
+GAP_COLOR = (40, 40, 40)  # Shown between the boards
+HIDDEN_COLOR = (0, 0, 0)
+TEXT_COLOR = (0, 0, 0)
+GAP = 4  # Pixels between neighbouring boards
+MATCH_REVEAL_DELAY = 500  # Milliseconds both picked cards stay visible before the match check
+FLIP_DURATION = 1000 * 100 / 60  # Milliseconds per card flip, as in the single-board game
+
+KIOSK_VOICE_EVENT = pygame.event.custom_type()  # Posted by the shared voice thread when it routes a command
+
+
+class KioskBoard:
+    """
+    One board of the kiosk. It draws into its own sub-surface of the display through two renderers, one for
+    its info bar and one for its cards, and only registers its cards when something on the board changed;
+    an idle board costs a timer check per frame and a repaint of its timer once a second.
+    """
+
+    def __init__(self, number, surface, bar_height, game, font, scheduler, seeds, sound=None, restart_delay=10000):
+        width, height = surface.get_size()
+        self.number = number
+        self.surface = surface
+        self.rect = pygame.Rect(surface.get_abs_offset(), (width, height))  # Where the board is on the display
+        self.game = game
+        self.font = font
+        self.atlas = None  # Shared by every board; set by the kiosk once the card size is known
+        self.scheduler = scheduler
+        self.seeds = seeds
+        self.sound = sound
+        self.restart_delay = restart_delay  # Milliseconds a cleared board stays up before a new one is dealt
+        self.bar = DirtyRenderer(surface.subsurface((0, 0, width, bar_height)), BAR_COLOR)
+        self.cards = DirtyRenderer(surface.subsurface((0, bar_height, width, height - bar_height)), BG_COLOR)
+        self.view = BoardView(game.cols, game.rows, self.cards.screen.get_rect(), min_card_size=1)
+        self.animations = TweenBatch()
+        self.commands = CommandChannel()  # Voice commands routed to this board
+        self.started = 0
+        self.finished = None
+        self.dirty = True
+        self._shown = None  # (seconds, turns) shown in the info bar
+
+    def card_at(self, pos):
+        """
+        Returns the index of the card under pos, a position on the display, or None.
+        """
+        return self.view.hit_test((pos[0] - self.cards.offset[0], pos[1] - self.cards.offset[1]))
+
+    def new_board(self, now):
+        self.scheduler.cancel_all((self.number, 'match'))
+        self.scheduler.cancel_all((self.number, 'restart'))
+        self.game.reset(self.seeds.getrandbits(32))
+        self.animations.clear()
+        self.commands.clear()  # Commands spoken for the previous board are stale
+        self.started = now
+        self.finished = None
+        self.dirty = True
+
+    def select(self, index, now):
+        """
+        Turns over the card at index. Returns False if the move is not allowed.
+        """
+        if self.finished is not None or not self.game.select(index):
+            return False
+
+        self.animations.start(index, now, FLIP_DURATION)
+        if self.game.pair_selected:
+            self.scheduler.call_later(now, MATCH_REVEAL_DELAY, self.resolve, tag=(self.number, 'match'))
+        self.dirty = True
+
+        return True
+
+    def resolve(self):
+        now = pygame.time.get_ticks()
+
+        if self.game.resolve() and self.sound is not None:
+            self.sound.play()
+
+        if self.game.is_complete:
+            self.finished = now
+            self.scheduler.call_later(now, self.restart_delay, self.new_board, now + self.restart_delay,
+                                      tag=(self.number, 'restart'))
+        self.dirty = True
+
+    def next_deadline(self, now):
+        """
+        Returns when the board's timer shows its next second, or None once the board is cleared.
+        """
+        if self.finished is not None:
+            return None
+
+        return self.started + ((now - self.started) // 1000 + 1) * 1000
+
+    def tick(self, now):
+        """
+        Advances the board's flips and repaints what changed. Returns True while cards are flipping.
+        """
+        animating = bool(self.animations)
+        if animating:
+            self.animations.update(now)
+
+        # One more repaint after the last flip ends, so the cards settle on their final look
+        if self.dirty or animating:
+            register_cards(self.cards, self.game, self.view, HIDDEN_COLOR, self.animations, self.font, self.atlas)
+            if self.finished is not None:
+                self.register_message(f"Cleared in {self.elapsed(now) // 60}:{self.elapsed(now) % 60:02d}!")
+            self.cards.present()
+
+        shown = (self.elapsed(now), self.game.turns)
+        if self.dirty or shown != self._shown:
+            self._shown = shown
+            self.draw_bar(*shown)
+        self.dirty = False
+
+        return animating
+
+    def elapsed(self, now):
+        """
+        Returns the seconds the board has been played, up to the moment it was cleared.
+        """
+        return max(0, ((self.finished if self.finished is not None else now) - self.started) // 1000)
+
+    def register_message(self, message):
+        width, height = self.cards.screen.get_size()
+        self.cards.region('message', game_over_message_box(message, self.font, width, height), message,
+                          lambda surface, rect: display_game_over_message(surface, message, self.font, TEXT_COLOR,
+                                                                          width, height))
+
+    def draw_bar(self, seconds, turns):
+        bar, font = self.bar, self.font
+        width, height = bar.screen.get_size()
+        label = f"Board {self.number}"
+        turns_text = f"Turns: {turns}"
+        timer_text = f"{seconds // 60:02}:{seconds % 60:02}"
+        timer_surface = text_cache.render_digits(font, timer_text, TEXT_COLOR, BAR_COLOR)
+        top = (height - font.get_height()) // 2
+
+        bar.region('label', pygame.Rect((8, top), font.size(label)), label,
+                   lambda surface, rect: display_text(surface, label, font, TEXT_COLOR, rect.topleft))
+        bar.region('timer', timer_surface.get_rect(center=(width // 2, height // 2)), timer_text,
+                   lambda surface, rect: surface.blit(timer_surface, rect))
+        turns_rect = pygame.Rect((0, top), font.size(turns_text))
+        turns_rect.right = width - 8
+        bar.region('turns', turns_rect, turns_text,
+                   lambda surface, rect: display_text(surface, turns_text, font, TEXT_COLOR, rect.topleft))
+        bar.present()
+
+
+class Kiosk:
+    """
+    Runs several independent boards side by side on one display from a single loop, e.g. on a classroom
+    wall. The boards share one card atlas, font, text cache, match sound and scheduler; with voice control
+    they also share one audio stream and recognizer, and spoken commands reach a board through their
+    "board N" prefix. Only the boards that changed are repainted, so adding idle boards costs little.
+    """
+
+    def __init__(self, screen, count, cols, rows, font, sound=None, seed=None, restart_delay=10000):
+        self.screen = screen
+        self.scheduler = Scheduler()
+        self.seeds = random.Random(seed)  # Draws the seed of every board of every session
+        self.voice_session = None  # VoicePipeline of the shared voice thread, for its counters
+        self.voice_latencies = []  # Seconds from end of speech to card selection for each voice command
+        self.routed = 0
+        self.unrouted = 0
+        self.frames = 0
+
+        self.grid_cols = math.ceil(math.sqrt(count))
+        grid_rows = math.ceil(count / self.grid_cols)
+        self.cell_width = screen.get_width() // self.grid_cols
+        self.cell_height = screen.get_height() // grid_rows
+        bar_height = font.get_linesize() + 8
+
+        pairs = cols * rows // 2
+        colors = board_faces(pairs)
+
+        self.boards = []
+        for index in range(count):
+            row, col = divmod(index, self.grid_cols)
+            rect = pygame.Rect(col * self.cell_width, row * self.cell_height, self.cell_width, self.cell_height)
+            self.boards.append(KioskBoard(index + 1, screen.subsurface(rect.inflate(-GAP, -GAP)), bar_height,
+                                          MemoryGame(cols, rows, colors), font, self.scheduler, self.seeds, sound,
+                                          restart_delay))
+
+        # Every board has the same card size, so one atlas serves them all
+        view = self.boards[0].view
+        self.atlas = CardAtlas(view.card_width, view.card_height, colors + [HIDDEN_COLOR])
+
+        now = pygame.time.get_ticks()
+        for board in self.boards:
+            board.atlas = self.atlas
+            board.new_board(now)
+        screen.fill(GAP_COLOR)
+
+    def board_at(self, pos):
+        """
+        Returns the board under pos, or None for the gaps between boards.
+        """
+        col, row = pos[0] // self.cell_width, pos[1] // self.cell_height
+        index = row * self.grid_cols + col
+        if col >= self.grid_cols or index >= len(self.boards):
+            return None
+
+        board = self.boards[index]
+        return board if board.rect.collidepoint(pos) else None
+
+    def handle(self, event, now):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            board = self.board_at(event.pos)
+            if board is None:
+                return
+
+            if board.finished is not None:
+                board.new_board(now)  # Clicking a cleared board deals the next one right away
+            else:
+                index = board.card_at(event.pos)
+                if index is not None:
+                    board.select(index, now)
+
+    def route(self, command, speech_end):
+        """
+        Queues a recognized command on the board it names. Runs on the voice thread. Returns False if the
+        command does not name a board and one of its cards.
+        """
+        target = parse_board_command(command, len(self.boards))
+        if target is None or target[1] > len(self.boards[target[0] - 1].game):
+            self.unrouted += 1
+            return False
+
+        board_number, card_number = target
+        self.boards[board_number - 1].commands.put(SelectCard(card_number - 1, speech_end))
+        self.routed += 1
+
+        return True
+
+    def tick(self, now):
+        """
+        Runs one frame for every board. Returns True while something is moving, so the loop keeps its frame
+        rate.
+        """
+        for board in self.boards:
+            if not board.commands:
+                continue
+            # Only as many commands as there are free picks; the rest wait until the pair is resolved
+            for action in board.commands.drain(2 - len(board.game.selected)):
+                if board.select(action.index, now):
+                    self.voice_latencies.append(time.perf_counter() - action.timestamp)
+
+        busy = self.scheduler.run_due(now) > 0
+        for board in self.boards:
+            busy = board.tick(now) or busy
+        self.frames += 1
+
+        return busy
+
+    def next_deadline(self, now):
+        """
+        Returns the next time a frame is needed without input: a scheduled action or a timer's next second.
+        """
+        deadlines = [self.scheduler.next_due()] + [board.next_deadline(now) for board in self.boards]
+
+        return min((deadline for deadline in deadlines if deadline is not None), default=None)
+
+    def report(self):
+        """
+        Returns a one-line summary of how many boards were repainted and how many pixels pushed per frame.
+        """
+        frames = max(1, self.frames)
+        repaints = sum(board.cards.frames for board in self.boards)
+        pixels = sum(board.cards.total_pixels + board.bar.total_pixels for board in self.boards)
+        screen_pixels = self.screen.get_width() * self.screen.get_height()
+
+        return (f"{len(self.boards)} boards, {self.frames} frames, {repaints / frames:.2f} boards repainted/frame, "
+                f"{pixels / frames:.0f} pixels/frame ({pixels / (screen_pixels * frames):.1%} of full-screen flips)")
+
+
+def kiosk_voice_thread(kiosk):
+    """
+    Listens to the microphone with one recognizer for every board and routes each spoken "board N, card"
+    command to its board.
+    """
+    def on_ready(pipeline):
+        kiosk.voice_session = pipeline
+
+    def on_command(command, speech_end):
+        if kiosk.route(command, speech_end):
+            print(f"Routed command: {command}")
+            pygame.event.post(pygame.event.Event(KIOSK_VOICE_EVENT))  # Wake the loop if it is idle
+
+    capture_voice(max(len(board.game) for board in kiosk.boards), on_command, len(kiosk.boards), on_ready)
+
+
+def window_size(text):
+    """
+    Parses a WIDTHxHEIGHT window size for argparse.
+    """
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+
+    return width, height
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Memory Game kiosk: several boards on one display')
+    parser.add_argument('--boards', type=int, default=4, help='number of boards (default 4)')
+    parser.add_argument('--board', type=board_size, default=(4, 4), metavar='COLSxROWS',
+                        help='size of every board (default 4x4)')
+    parser.add_argument('--window', type=window_size, default=(1280, 720), metavar='WIDTHxHEIGHT')
+    parser.add_argument('--fullscreen', action='store_true', help='fill the whole display')
+    parser.add_argument('--fps', type=int, default=60, help='frame rate cap, 0 for uncapped')
+    parser.add_argument('--restart-delay', type=float, default=10.0,
+                        help='seconds a cleared board stays up before a new one is dealt (default 10)')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the session, to deal the same boards again')
+    parser.add_argument('--voice', action='store_true',
+                        help='voice control for every board through one microphone: "board two, seven"')
+    parser.add_argument('--render-stats', action='store_true', help='print renderer statistics on exit')
+    parser.add_argument('--voice-stats', action='store_true', help='print voice command latency on exit')
+
+    options = parser.parse_args(argv)
+    if options.boards < 1:
+        parser.error("--boards must be at least 1")
+    if options.board[0] * options.board[1] > 2 * MAX_GENERATED_FACES:
+        parser.error(f"--board can have at most {2 * MAX_GENERATED_FACES} cards, so every pair looks different")
+
+    return options
+
+
+def run_kiosk():
+    options = parse_arguments(sys.argv[1:])
+
+    if options.voice:
+        voice_engine.preload()  # Loads while the display and audio start
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_caption('Memory Game Kiosk')
+    screen = pygame.display.set_mode((0, 0) if options.fullscreen else options.window,
+                                     pygame.FULLSCREEN if options.fullscreen else 0)
+    font = pygame.font.SysFont("calibri", 20)
+    pygame.mixer.init()
+    match_sound = pygame.mixer.Sound('match.wav')
+
+    kiosk = Kiosk(screen, options.boards, *options.board, font, match_sound, options.seed,
+                  int(options.restart_delay * 1000))
+    text_cache.preload_digits(font, TEXT_COLOR, BAR_COLOR)
+    pygame.display.flip()
+
+    if options.voice:
+        voice_thread = threading.Thread(target=kiosk_voice_thread, args=(kiosk,), name='kiosk-voice')
+        voice_thread.daemon = True
+        voice_thread.start()
+
+    pacer = FramePacer(options.fps)  # Full frame rate while a board changes, blocking waits while all are idle
+    running = True
+
+    while running:
+        events = pacer.events()
+        now = pygame.time.get_ticks()
+
+        for event in events:
+            if event.type == pygame.QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+            else:
+                kiosk.handle(event, now)
+
+        busy = kiosk.tick(now)
+        pacer.pace(bool(events) or busy, kiosk.next_deadline(pygame.time.get_ticks()))
+
+    if options.render_stats:
+        print(f"Render stats: {kiosk.report()}")
+        print(f"Text cache stats: {text_cache.stats()}")
+        print(f"Frame pacing: {pacer.report()}")
+
+    if options.voice_stats:
+        print(f"Voice latency: {latency_summary(kiosk.voice_latencies)}")
+        print(f"Voice commands: {kiosk.routed} routed, {kiosk.unrouted} not for a board")
+        if kiosk.voice_session is not None:
+            print(f"Voice audio: {kiosk.voice_session.stats()}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run_kiosk()
@@ -1,169 +1,235 @@
+import time
+
+startup_started = time.perf_counter()  # Taken before the other imports so --startup-profile can include them
+
+import argparse
+import os
 import pygame
 import random
 import threading
-from vosk import Model, KaldiRecognizer
-import os
 import sys
-import json
-import pyaudio
+
+import net_protocol
+
+from animation import TweenBatch
+from board_view import BoardView
+from card_atlas import CardAtlas
+from board_ui import (board_faces, board_size, display_game_over_message, display_text, game_over_message_box,
+                      register_cards)
+from card_faces import MAX_GENERATED_FACES
+from command_channel import CommandChannel, SelectCard
+from frame_pacer import FramePacer
+from frame_profiler import FrameProfiler
+from game_core import MemoryGame
+from renderer import DirtyRenderer
+from replay_log import (AI, GAME_OVER, MATCH, MISS, MOUSE, REJECTED, RESET, RESOLVE, SELECT, SELECTED, SYSTEM,
+                        TIME_ATTACK, VOICE, VOICE_CONTROL, ReplayLog, ReplayWriter)
+from scheduler import Scheduler
+from stats_store import MODE_SINGLE, MODE_TIME_ATTACK, MODE_VERSUS, STATS_PATH, StatsStore
+from strategies import STRATEGIES
+from text_cache import text_cache
+from voice_engine import LOADING, voice_engine
+from voice_capture import capture_voice
+from voice_pipeline import latency_summary, parse_card_number
 
 
 # Initialize global variables for voice control
-voice_command_queue = []
+VOICE_COMMAND_EVENT = pygame.USEREVENT + 1  # Posted by the voice thread when it queues a command
+voice_commands = CommandChannel()  # Validated SelectCard actions from the voice thread
+voice_session = None  # VoicePipeline of the running voice thread, for its counters
+voice_latencies = []  # Seconds from end of speech to card selection for each voice command
 voice_control_mode = False
-selected_cards = []
-cards = []
-matched_cards = []
+game = None  # MemoryGame holding the board, selections, scores and whose turn it is
 game_over = False
-current_player = 1
-scores = {1: 0, 2: 0}
-card_animations = {}  # Track animation state of cards
+card_animations = TweenBatch()  # Track animation state of cards
 animation_in_progress = False
 num_players = 1
+session_seeds = random.Random()  # Draws the seed of every board, so a session is reproducible from one seed
+replay_writer = None  # ReplayWriter recording the running session, if any
+ai_opponent = None  # AIOpponent playing player 2, if any
+AI_MOVE_EVENT = pygame.event.custom_type()  # Posted by the AI worker to wake the game loop
+remote_game = None  # RemoteGame mirroring the board of a net_server room, if connected
+NETWORK_EVENT = pygame.event.custom_type()  # Posted by the network thread when server updates arrive
 
+MATCH_REVEAL_DELAY = 500  # Milliseconds both picked cards stay visible before the match check
+FLIP_DURATION = 1000 * 100 / 60  # Milliseconds per card flip, the same 100 frames at 60 FPS as before
 
-def voice_control_thread():
-    model_path = "vosk-model-small-en-us-0.15"
-    if not os.path.exists(model_path):
-        print("Please download the model from https://alphacephei.com/vosk/models and unpack as 'model' in the "
-              "current folder.")
-        sys.exit(1)
 
-    model = Model(model_path)
-    recognizer = KaldiRecognizer(model, 16000)
+class StartupProfile:
+    """
+    Records how long each startup phase took, for --startup-profile.
+    """
 
-    p = pyaudio.PyAudio()
-    stream = p.open(format=pyaudio.paInt16, channels=1, rate=16000, input=True, frames_per_buffer=4096)
-    stream.start_stream()
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.phases = []  # [(name, phase ms, ms since start)]
 
-    while True:
-        data = stream.read(4096)
-        if recognizer.AcceptWaveform(data):
-            result = json.loads(recognizer.Result())
-            command = result.get('text', '').strip().lower()
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000, (now - self.started) * 1000))
+        self.last = now
 
-            if command:
-                print(f"Appended command: {command}")
-                voice_command_queue.append(command)
+    def report(self):
+        lines = ["Startup profile:"]
+        for name, phase_ms, total_ms in self.phases:
+            lines.append(f"  {name:<24} {phase_ms:8.1f} ms  (at {total_ms:8.1f} ms)")
 
+        return "\n".join(lines)
 
-# Modified to return a boolean indicating whether an action was taken
-def process_voice_commands():
-    number_words_to_digits = {
-        "one": "1",
-        "two": "2",
-        "three": "3",
-        "four": "4",
-        "five": "5",
-        "six": "6",
-        "seven": "7",
-        "eight": "8",
-        "nine": "9",
-        "ten": "10",
-        "eleven": "11",
-        "twelve": "12",
-        "thirteen": "13",
-        "fourteen": "14",
-        "fifteen": "15",
-        "sixteen": "16",
-        "seventeen": "17",
-        "eighteen": "18",
-        "nineteen": "19",
-        "twenty": "20"
-    }
-    action_taken = False  # Flag to track if any action was taken based on a voice command
 
-    while voice_command_queue:
-        command = voice_command_queue.pop(0).strip().lower()
-        print(f"Processing command: {command}")
+def voice_control_thread(card_count):
+    """
+    Listens to the microphone and queues a SelectCard for every spoken card number between 1 and card_count.
+    Commands are parsed and validated here so the game loop only ever receives card selections.
+    """
+    def on_ready(pipeline):
+        global voice_session
+        voice_session = pipeline
 
-        # Convert number words to digits
-        if command in number_words_to_digits:
-            command = number_words_to_digits[command]
+    def on_command(command, speech_end):
+        card_number = parse_card_number(command)
 
-            print(f"{int(command)}: is a number = {command.isdigit()}")
+        if card_number is not None and 1 <= card_number <= card_count:
+            print(f"Appended command: {command}")
+            voice_commands.put(SelectCard(card_number - 1, speech_end))
+            pygame.event.post(pygame.event.Event(VOICE_COMMAND_EVENT))  # Wake the game loop if it is idle
 
-        if command.isdigit():
-            card_number = int(command) - 1
+    capture_voice(card_count, on_command, on_ready=on_ready)
 
-            if 0 <= card_number < len(cards):
-                selected_cards.append(card_number)
-                action_taken = True
+
+# Modified to return a boolean indicating whether an action was taken
+def process_voice_commands(scheduler, match_sound):
+    action_taken = False  # Flag to track if any action was taken based on a voice command
+
+    # Only take as many commands as there are free picks; the rest wait until the pair is resolved
+    for action in voice_commands.drain(2 - len(game.selected)):
+        print(f"Processing command: select card {action.index + 1}")
+
+        if pick_card(game, action.index, VOICE, scheduler, match_sound):
+            voice_latencies.append(time.perf_counter() - action.timestamp)  # End of speech to card selection
+            action_taken = True
 
     return action_taken
 
 
-def reset_game(colors, cols, rows):
-    global cards
+def select_card(game, index, source):
+    """
+    Turns over the card at index for the given input source and tells the replay log and the AI opponent.
+    Returns False if the move is not allowed.
+    """
+    selected = game.select(index)
 
-    cards = colors[:cols * rows // 2] * 2
-    random.shuffle(cards)
+    if replay_writer is not None:
+        replay_writer.record(SELECT, source, SELECTED if selected else REJECTED, index)
+    if selected and ai_opponent is not None:
+        ai_opponent.turned(index)
 
-    return cards, [], [], False, pygame.time.get_ticks(), 1, {1: 0, 2: 0}
+    return selected
 
 
-def draw_cards(screen, cards, selected_cards, matched_cards, card_width, card_height, cols, hidden_color,
-               info_bar_height, card_animations, font):
+def pick_card(game, index, source, scheduler, match_sound):
     """
-    Draws the cards on the screen, now accounting for animation states.
+    Selects a card for any input source (mouse, voice, replay or AI): starts its flip and, once a pair is
+    picked, schedules the match check. Returns False if the move is not allowed.
     """
-    for index, card in enumerate(cards):
-        row, col = divmod(index, cols)
-        x = col * card_width
-        y = row * card_height + info_bar_height
+    # select() refuses matched or already picked cards, and any pick while a pair is revealed
+    if not select_card(game, index, source):
+        return False
 
-        animation = card_animations.get(index)
+    card_animations.start(index, pygame.time.get_ticks(), FLIP_DURATION)
+    if game.pair_selected:
+        # Show both cards for a moment before checking for a match, without blocking
+        scheduler.call_later(pygame.time.get_ticks(), MATCH_REVEAL_DELAY, check_for_match, game, match_sound,
+                             tag='match')
 
-        if animation:
-            width = card_width * (1 - abs(animation['progress'] - 0.5) * 2)
-            x += (card_width - width) / 2
-            color = animation['color'] if animation['progress'] >= 0.5 else hidden_color
-        else:
-            width = card_width
-            color = card if index in matched_cards or index in selected_cards else hidden_color
+    return True
 
-        rect = pygame.Rect(x, y, width, card_height)
-        pygame.draw.rect(screen, color, rect)
-        pygame.draw.rect(screen, (0, 0, 0), rect, 3)  # Draw card border
 
-        # Check if the card is not matched to draw its number
-        if index not in matched_cards:
-            # Calculate the position to draw the number. Adjust the positioning as needed.
-            number_text = font.render(str(index + 1), True, (255, 255, 255))
-            text_rect = number_text.get_rect(center=rect.center)
-            screen.blit(number_text, text_rect)
+def reset_game(game, source=SYSTEM):
+    """
+    Shuffles a new board with the session's next seed and returns the reset game over flag and the new
+    start time. source is what asked for the reset, for the replay log.
+    """
+    seed = session_seeds.getrandbits(32)
+    game.reset(seed)
+    card_animations.clear()  # Flips still running belong to the old board
 
+    if replay_writer is not None:
+        replay_writer.record(RESET, source, value=seed)
+    if ai_opponent is not None:
+        ai_opponent.new_board(game)
 
-def check_for_match(cards, selected_cards, matched_cards, match_sound, scores, current_player):
-    match = False
+    return False, pygame.time.get_ticks()
 
-    if len(selected_cards) == 2:
-        if cards[selected_cards[0]] == cards[selected_cards[1]]:
-            matched_cards.extend(selected_cards)
-            scores[current_player] += 1
-            match_sound.play()
-            match = True
 
-        selected_cards.clear()
+def check_for_match(game, match_sound):
+    """
+    Resolves the selected pair and plays the match sound on a match. Runs as a deferred action once the
+    reveal delay is over.
+    """
+    match = game.resolve()
+
+    if replay_writer is not None:
+        replay_writer.record(RESOLVE, outcome=MATCH if match else MISS, value=game.turns)
+    if ai_opponent is not None:
+        ai_opponent.resolved()
+
+    if match:
+        match_sound.play()
 
     return match
 
 
-def display_text(screen, text, font, color, position):
+def draw_button(screen, rect, text_surface, button_color, padding_horizontal, padding_vertical):
+    """
+    Draws a button background with its label.
+    """
+    pygame.draw.rect(screen, button_color, rect)
+    screen.blit(text_surface, (rect.x + padding_horizontal, rect.y + padding_vertical))
+
+
+def draw_profiler_overlay(screen, rect, lines, font):
+    """
+    Draws the frame profiling overlay. Its lines change every refresh, so they are rendered directly instead
+    of through the text cache, where they would only evict card numbers.
+    """
+    screen.fill((20, 20, 20), rect)
+
+    for index, line in enumerate(lines):
+        screen.blit(font.render(line, True, (0, 255, 0)), (rect.x + 5, rect.y + 5 + index * font.get_linesize()))
+
+
+def leaderboard_lines(entries, mode):
     """
-    Renders text on the screen at the specified position.
+    Returns the text lines of the leaderboard shown under the game over message.
     """
-    text_surface = font.render(text, True, color)
-    screen.blit(text_surface, position)
+    if mode == MODE_TIME_ATTACK:
+        lines = ["Most Time Attack rounds"]
+        lines.extend(f"{rank}. {rounds} rounds in {elapsed_ms // 60000}:{elapsed_ms // 1000 % 60:02d}"
+                     for rank, (elapsed_ms, turns, rounds, _) in enumerate(entries, 1))
+    else:
+        lines = ["Best times"]
+        lines.extend(f"{rank}. {elapsed_ms // 60000}:{elapsed_ms // 1000 % 60:02d} in {turns} turns"
+                     for rank, (elapsed_ms, turns, rounds, _) in enumerate(entries, 1))
+
+    return lines
+
+
+def draw_leaderboard(screen, rect, lines, font, text_color):
+    pygame.draw.rect(screen, (100, 100, 100), rect)
+
+    for index, line in enumerate(lines):
+        screen.blit(text_cache.render(font, line, text_color), (rect.x + 10, rect.y + 5 + index * font.get_linesize()))
 
 
 def display_difficulty_selection(screen, font, text_color):
-    difficulties = ["Easy", "Medium", "Hard"]
+    difficulties = ["Easy", "Medium", "Hard", "Huge"]
     difficulty_rects = []
     screen.fill((255, 255, 255))  # Fill the screen with background color first
 
     for index, difficulty in enumerate(difficulties):
-        text = font.render(difficulty, True, text_color)
+        text = text_cache.render(font, difficulty, text_color)
         rect = text.get_rect(center=(320, 120 + index * 60))
         difficulty_rects.append(rect)
         screen.blit(text, rect)
@@ -173,32 +239,23 @@ def display_difficulty_selection(screen, font, text_color):
     return difficulty_rects
 
 
-def display_game_over_message(screen, message, font, text_color, screen_width, screen_height):
-    game_over_surface = font.render(message, True, text_color)
-    message_box_width = max(200, game_over_surface.get_width() + 20)
-    message_box_height = 100
-    message_box_x = (screen_width - message_box_width) // 2
-    message_box_y = (screen_height - message_box_height) // 2
-
-    pygame.draw.rect(screen, (100, 100, 100), (message_box_x, message_box_y, message_box_width, message_box_height))
-    game_over_x = message_box_x + (message_box_width - game_over_surface.get_width()) // 2
-    game_over_y = message_box_y + (message_box_height - game_over_surface.get_height()) // 2
-    screen.blit(game_over_surface, (game_over_x, game_over_y))
-
-
-def main_menu(screen, font, text_color):
+def main_menu(screen, font, text_color, voice_status=None):
+    """
+    Shows the mode buttons and returns (num_players, time_attack, voice_control).
+    voice_status, if given, returns a line about the voice model that is kept up to date under the buttons.
+    """
     title_text = "Pick the game player's mode:"
-    title_surface = font.render(title_text, True, text_color)
+    title_surface = text_cache.render(font, title_text, text_color)
     title_rect = title_surface.get_rect(center=(320, 240 - 60))
 
     button_color = (150, 150, 150)
     button_padding_horizontal = 20  # Increase padding if necessary
     button_spacing = 10
 
-    one_player_text = font.render('1 Player', True, text_color)
-    two_player_text = font.render('2 Players', True, text_color)
-    time_attack_text = font.render('Time Attack', True, text_color)
-    voice_control_text = font.render('Voice Control', True, text_color)
+    one_player_text = text_cache.render(font, '1 Player', text_color)
+    two_player_text = text_cache.render(font, '2 Players', text_color)
+    time_attack_text = text_cache.render(font, 'Time Attack', text_color)
+    voice_control_text = text_cache.render(font, 'Voice Control', text_color)
 
     # Calculate button widths based on text widths
     one_player_button_width = one_player_text.get_width() + button_padding_horizontal
@@ -244,35 +301,110 @@ def main_menu(screen, font, text_color):
     num_players = None
     time_attack = False
     voice_control = False  # Variable to track if voice control mode is selected
+    shown_status = None
+    status_rect = pygame.Rect(0, 240 + 50, screen.get_width(), font.get_height())
 
     while not num_players:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if one_player_button.collidepoint(event.pos):
-                    num_players = 1
-                elif two_player_button.collidepoint(event.pos):
-                    num_players = 2
-                elif time_attack_button.collidepoint(event.pos):
-                    num_players = 1  # Time Attack mode is a kind of single-player mode
-                    time_attack = True
-                elif voice_control_button.collidepoint(event.pos):
-                    num_players = 1
-                    voice_control = True  # Set voice control mode to True when selected
+        # Keep the voice model status line current while the model loads in the background
+        if voice_status is not None and voice_status() != shown_status:
+            shown_status = voice_status()
+            status_surface = text_cache.render(font, shown_status, text_color)
+            screen.fill((255, 255, 255), status_rect)
+            screen.blit(status_surface, status_surface.get_rect(center=status_rect.center))
+            pygame.display.update(status_rect)
+
+        # Sleep until input; while the model loads, also wake up now and then to refresh its status line
+        timeout = 250 if voice_status is not None and voice_engine.state == LOADING else 0
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            return
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if one_player_button.collidepoint(event.pos):
+                num_players = 1
+            elif two_player_button.collidepoint(event.pos):
+                num_players = 2
+            elif time_attack_button.collidepoint(event.pos):
+                num_players = 1  # Time Attack mode is a kind of single-player mode
+                time_attack = True
+            elif voice_control_button.collidepoint(event.pos):
+                num_players = 1
+                voice_control = True  # Set voice control mode to True when selected
 
     return num_players, time_attack, voice_control
 
 
+def replay_file(path):
+    """
+    Opens a session log for argparse.
+    """
+    try:
+        return ReplayLog(path)
+    except (OSError, ValueError) as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def server_address(text):
+    """
+    Parses a HOST:PORT server address for argparse.
+    """
+    host, _, port = text.rpartition(':')
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT, got {text!r}")
+
+    return host, int(port)
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Memory Game')
+    parser.add_argument('--fps', type=int, default=60, help='frame rate cap, 0 for uncapped')
+    parser.add_argument('--huge-board', type=board_size, default=(40, 25), metavar='COLSxROWS',
+                        help='board size of the Huge difficulty (default 40x25)')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the session, to play the same boards again')
+    parser.add_argument('--record-dir', default='replays', help='folder the session logs are written to')
+    parser.add_argument('--no-record', action='store_true', help='do not write a session log')
+    parser.add_argument('--stats-db', default=STATS_PATH, help='SQLite file the results and leaderboards are kept in')
+    parser.add_argument('--no-stats', action='store_true', help='do not record results')
+    parser.add_argument('--opponent', choices=sorted(STRATEGIES),
+                        help='in Two Players mode, player 2 is the computer playing this strategy')
+    parser.add_argument('--think-time', type=float, default=0.6,
+                        help='seconds the computer takes at least for each pick (default 0.6)')
+    parser.add_argument('--replay', type=replay_file, metavar='LOG', help='watch a recorded session in real time')
+    parser.add_argument('--connect', type=server_address, metavar='HOST:PORT',
+                        help='play in a room of a net_server.py game server')
+    parser.add_argument('--room', default='lobby',
+                        help='room to join with --connect; the first player picks its difficulty (default lobby)')
+    parser.add_argument('--render-stats', action='store_true', help='print renderer statistics on exit')
+    parser.add_argument('--profile-overlay', action='store_true',
+                        help='start with the frame profiling overlay shown (toggle with F3)')
+    parser.add_argument('--profile-out', metavar='PATH',
+                        help='stream per-frame timings to PATH (.csv for CSV, JSON Lines otherwise)')
+    parser.add_argument('--startup-profile', action='store_true', help='print how long each startup phase took')
+    parser.add_argument('--voice-stats', action='store_true', help='print voice command latency on exit')
+    parser.add_argument('--no-voice-preload', action='store_true',
+                        help='only load the voice model once Voice Control is picked')
+
+    options = parser.parse_args(argv)
+    if options.connect is not None and options.replay is not None:
+        parser.error("--connect and --replay cannot be combined")
+    if options.huge_board[0] * options.huge_board[1] > 2 * MAX_GENERATED_FACES:
+        parser.error(f"--huge-board can have at most {2 * MAX_GENERATED_FACES} cards, so every pair looks different")
+
+    return options
+
+
 def run_game():
-    global voice_command_queue, voice_control_mode, selected_cards, cards, matched_cards, game_over, current_player, \
-        scores, card_animations, animation_in_progress, num_players
-    pygame.init()
-    pygame.mixer.init()
+    global voice_commands, voice_control_mode, game, game_over, card_animations, animation_in_progress, \
+        num_players, replay_writer, ai_opponent, remote_game
+    options = parse_arguments(sys.argv[1:])
+    startup_profile = StartupProfile(startup_started)
+    startup_profile.mark('imports')
+
+    # Only the display and fonts are needed for the menus; audio is opened once a mode has been picked
+    pygame.display.init()
     pygame.font.init()
-    match_sound = pygame.mixer.Sound('match.wav')
     pygame.display.set_caption('Memory Game')
+    startup_profile.mark('display and font init')
 
     # Game settings
     screen_width, screen_height = 640, 480
@@ -284,54 +416,125 @@ def run_game():
     button_color = (150, 150, 150)  # Color for the reset button
     hidden_color = (0, 0, 0)
     text_color = (0, 0, 0)
-    colors = [
-        (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
-        (255, 0, 255), (0, 255, 255), (128, 0, 0), (0, 128, 0),
-        (0, 0, 128), (128, 128, 0), (128, 0, 128), (0, 128, 128),
-        (192, 192, 192), (128, 128, 128), (64, 0, 0), (0, 64, 0),
-        (0, 0, 64), (64, 64, 0), (64, 0, 64), (0, 64, 64)
-    ]
 
     font = pygame.font.SysFont("calibri", 24)  # Creates a default system font of size 36
-    clock = pygame.time.Clock()  # Setup the clock for controlling frame rate
+    startup_profile.mark('font lookup')
 
-    card_animations = {}  # Track animation state of cards
+    card_animations = TweenBatch()  # Track animation state of cards
 
-    # Difficulty selection
-    difficulty_rects = display_difficulty_selection(screen, font, text_color)
+    # Difficulty selection; a replay takes the board and modes from its log instead of the menus
+    replay = options.replay
+    # Opened now so the leaderboard cache warms up in the background while the menus are shown
+    recorded = replay is None and options.connect is None  # Replays and online games are not ranked
+    stats = StatsStore(options.stats_db) if recorded and not options.no_stats else None
     difficulty = None
-
-    while difficulty is None:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                for i, rect in enumerate(difficulty_rects):
-                    if rect.collidepoint(event.pos):
-                        difficulty = ["Easy", "Medium", "Hard"][i]
-                        break
+    if replay is None:
+        difficulty_rects = display_difficulty_selection(screen, font, text_color)
+    startup_profile.mark('first frame')
+
+    # Load the voice model in the background while the player is in the menus
+    if not options.no_voice_preload and replay is None:
+        voice_engine.preload()
+
+    while difficulty is None and replay is None:
+        event = pygame.event.wait()  # Nothing on this screen changes by itself, so sleep until input
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            return
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for i, rect in enumerate(difficulty_rects):
+                if rect.collidepoint(event.pos):
+                    difficulty = ["Easy", "Medium", "Hard", "Huge"][i]
+                    break
 
     # Adjust game settings based on difficulty
-    cols, rows = {"Easy": (3, 4), "Medium": (4, 4), "Hard": (5, 4)}[difficulty]
-    card_width, card_height = screen_width // cols, game_area_height // rows
+    if replay is not None:
+        cols, rows = replay.cols, replay.rows
+    else:
+        cols, rows = {"Easy": (3, 4), "Medium": (4, 4), "Hard": (5, 4), "Huge": options.huge_board}[difficulty]
+
+    if options.connect is not None:
+        # Imported here so the network thread only exists in online games
+        from net_client import RemoteGame
+        try:
+            remote_game = RemoteGame(*options.connect, options.room, cols, rows,
+                                     on_update=lambda: pygame.event.post(pygame.event.Event(NETWORK_EVENT)))
+        except ConnectionError as error:
+            print(f"Cannot join room {options.room}: {error}")
+            pygame.quit()
+            return
+        cols, rows = remote_game.cols, remote_game.rows  # A room that is already running keeps its board
+    if cols * rows > 2 * MAX_GENERATED_FACES:
+        print(f"A {cols}x{rows} board has more pairs than the {MAX_GENERATED_FACES} faces that can be told apart")
+        if remote_game is not None:
+            remote_game.close()
+        pygame.quit()
+        return
+    faces = board_faces(cols * rows // 2)
+    view = BoardView(cols, rows, (0, info_bar_height, screen_width, game_area_height))
+    atlas = CardAtlas(view.card_width, view.card_height, faces + [hidden_color])
 
-    cards, selected_cards, matched_cards, game_over, start_time, current_player, scores = reset_game(colors, cols, rows)
     # Main menu call now returns whether Time Attack mode is selected
-    num_players, time_attack_mode, voice_control_mode = main_menu(screen, font, text_color)
+    if replay is not None:
+        num_players, time_attack_mode = replay.players, bool(replay.flags & TIME_ATTACK)
+        voice_control_mode = False  # Recorded voice commands are replayed like clicks
+        session_seed = replay.seed
+    elif remote_game is not None:
+        # The room decides the number of players; online games are played with the mouse
+        num_players, time_attack_mode, voice_control_mode = remote_game.num_players, False, False
+        session_seed = 0  # The server shuffles the boards
+    else:
+        num_players, time_attack_mode, voice_control_mode = main_menu(screen, font, text_color,
+                                                                      voice_engine.status_text)
+        session_seed = options.seed if options.seed is not None else random.getrandbits(32)
+    session_seeds.seed(session_seed)
+
+    if replay is None and remote_game is None and not options.no_record:
+        os.makedirs(options.record_dir, exist_ok=True)
+        log_path = os.path.join(options.record_dir, time.strftime('session-%Y%m%d-%H%M%S') + f'-{session_seed}.mgr')
+        flags = (TIME_ATTACK if time_attack_mode else 0) | (VOICE_CONTROL if voice_control_mode else 0)
+        replay_writer = ReplayWriter(log_path, cols, rows, num_players, flags, session_seed, pygame.time.get_ticks)
+
+    if options.opponent is not None and num_players == 2 and replay is None and remote_game is None:
+        # Imported here so the worker thread only exists in games against the computer
+        from ai_player import AIOpponent
+        ai_opponent = AIOpponent(options.opponent, think_time=options.think_time,
+                                 on_move=lambda: pygame.event.post(pygame.event.Event(AI_MOVE_EVENT)))
+
+    # Recorded picks and resets are fed to the game once the session has run as long as when they happened
+    replay_records = replay.records() if replay is not None else iter(())
+    replay_next = next(replay_records, None)
+    replay_started = pygame.time.get_ticks()
+
+    if remote_game is not None:
+        game = remote_game
+        game.faces = tuple(faces)
+        game.apply_updates()  # The board as it was when we joined
+        game_over, start_time = False, pygame.time.get_ticks()
+    else:
+        game = MemoryGame(cols, rows, faces, num_players)
+        game_over, start_time = reset_game(game)
+    startup_profile.mark('menus (player input)')
+
+    pygame.mixer.init()
+    match_sound = pygame.mixer.Sound('match.wav')
+    startup_profile.mark('audio init')
+
+    if options.startup_profile:
+        print(startup_profile.report())
 
     # Define button sizes and positions
     button_padding_horizontal = 10
     button_padding_vertical = 5
 
     # Draw reset button and define play again button
-    reset_text = font.render('Reset', True, text_color)
+    reset_text = text_cache.render(font, 'Reset', text_color)
     reset_button_width = reset_text.get_width() + (2 * button_padding_horizontal)
     reset_button_height = font.size('Test')[1] + (2 * button_padding_vertical)
     reset_button_rect = pygame.Rect(10, (info_bar_height - reset_button_height) // 2 + 25, reset_button_width,
                                     reset_button_height)  # Adjusted position
 
-    play_again_text = font.render('Play Again', True, text_color)
+    play_again_text = text_cache.render(font, 'Play Again', text_color)
     play_again_button_width = play_again_text.get_width() + (2 * button_padding_horizontal)
     play_again_button_height = reset_button_height
     play_again_button_rect = pygame.Rect(screen_width - play_again_button_width - 10,
@@ -339,11 +542,21 @@ def run_game():
                                          play_again_button_width, play_again_button_height)  # Adjusted position
 
     if voice_control_mode:
-        voice_thread = threading.Thread(target=voice_control_thread, args=())
+        voice_thread = threading.Thread(target=voice_control_thread, args=(len(game),))
         voice_thread.daemon = True
         voice_thread.start()
 
     # Main game loop
+    renderer = DirtyRenderer(screen, bg_color)
+    pacer = FramePacer(options.fps)  # Full frame rate while something changes, blocking waits while idle
+    profiler = FrameProfiler(export_path=options.profile_out)
+    overlay_visible = options.profile_overlay
+    overlay_font = pygame.font.SysFont("consolas", 16) if overlay_visible else None
+    overlay_lines = ()
+    overlay_refresh_at = 0
+    scheduler = Scheduler()
+    scroll_keys = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+    text_cache.preload_digits(font, text_color, info_bar_color)
     running = True
     end_time = None
     play_again_visible = False
@@ -351,63 +564,114 @@ def run_game():
     time_attack_time_limit = 60
     time_attack_time_decrement = 5
     time_attack_start_time = None
+    time_attack_began = None
+    time_attack_rounds = 0
+    stats_difficulty = difficulty if difficulty != "Huge" else f"Huge {cols}x{rows}"  # Huge sizes rank apart
+    finished_mode = None  # Mode of the game that just ended, for the leaderboard
 
     while running:
-        screen.fill(bg_color)
-        draw_cards(screen, cards, selected_cards, matched_cards, card_width, card_height, cols, hidden_color,
-                   info_bar_height, card_animations, font)
+        # Advance card flips by real elapsed time so their speed does not depend on the frame rate
+        card_animations.update(pygame.time.get_ticks())
 
-        for event in pygame.event.get():
+        events = pacer.events()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEWHEEL:
+                view.zoom_at(1.1 ** event.y, pygame.mouse.get_pos())  # Zoom around the mouse pointer
+            elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                view.scroll(-event.rel[0], -event.rel[1])  # Drag with the right button to pan
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                overlay_visible = not overlay_visible  # Toggle the profiling overlay
+                overlay_font = overlay_font or pygame.font.SysFont("consolas", 16)
+            elif event.type == pygame.KEYDOWN and event.key in scroll_keys:
+                dx, dy = scroll_keys[event.key]
+                view.scroll(dx * view.card_width, dy * view.card_height)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and replay_next is None:
+                # Right-drag pans and the wheel zooms; picks and resets wait until a replay has played out, as
+                # anything else would change the board under the recorded picks
                 mouse_x, mouse_y = event.pos
                 if play_again_visible and play_again_button_rect.collidepoint(mouse_x, mouse_y):
-                    cards, selected_cards, matched_cards, game_over, start_time, current_player, scores = reset_game(
-                        colors, cols, rows)
+                    scheduler.cancel_all()
+                    voice_commands.clear()  # Commands spoken for the previous board are stale
+                    game_over, start_time = reset_game(game, MOUSE)
                     play_again_visible = False
                     continue
                 if not play_again_visible and reset_button_rect.collidepoint(event.pos):
-                    cards, selected_cards, matched_cards, game_over, start_time, current_player, scores = reset_game(
-                        colors, cols, rows)
+                    scheduler.cancel_all()
+                    voice_commands.clear()
+                    game_over, start_time = reset_game(game, MOUSE)
                 elif not play_again_visible:
-                    if mouse_y > info_bar_height:
-                        col = mouse_x // card_width
-                        row = (mouse_y - info_bar_height) // card_height
-                        index = row * cols + col
-
-                        if 0 <= index < len(cards) and index not in selected_cards + matched_cards:
-                            card_animations[index] = {'progress': 0, 'color': hidden_color}  # Initialize animation
-                            selected_cards.append(index)
-
-                            if len(selected_cards) == 2:
-                                pygame.time.wait(500)
-                                match = check_for_match(cards, selected_cards, matched_cards, match_sound, scores,
-                                                        current_player)
-                                if not match and num_players == 2:
-                                    current_player = 2 if current_player == 1 else 1  # Change
-
-        # Process voice commands if in voice control mode
-        if voice_control_mode and not animation_in_progress:
-            if process_voice_commands():
-                # If a command was processed, handle card selection and check for matches
-                if len(selected_cards) == 2:
-                    pygame.time.wait(500)  # Short pause to show cards before checking for a match
-                    match = check_for_match(cards, selected_cards, matched_cards, match_sound, scores,
-                                            current_player)
-                    if not match and num_players == 2:
-                        current_player = 2 if current_player == 1 else 1  # Switch players in 2 player mode
+                    index = view.hit_test(event.pos)
+                    if ai_opponent is not None and game.current_player == ai_opponent.player:
+                        index = None  # The computer is playing this turn
+
+                    if index is not None:
+                        pick_card(game, index, MOUSE, scheduler, match_sound)
+
+        while replay_next is not None and replay_next.tick <= pygame.time.get_ticks() - replay_started:
+            if replay_next.kind == SELECT:
+                pick_card(game, replay_next.value, replay_next.source, scheduler, match_sound)
+            elif replay_next.kind == RESET and replay_next.source == MOUSE:
+                scheduler.cancel_all()
+                game_over, start_time = reset_game(game, MOUSE)
+                play_again_visible = False
+            # Resets by the game itself, match checks and game overs happen on their own as the picks replay
+
+            replay_next = next(replay_records, None)
+
+        # Online, the board only changes through the server's updates; picks and resets were just sent to it
+        if remote_game is not None:
+            for update in remote_game.apply_updates():
+                if update[0] == net_protocol.REVEAL:
+                    card_animations.start(update[1], pygame.time.get_ticks(), FLIP_DURATION)
+                elif update[0] == net_protocol.MATCH:
+                    match_sound.play()
+                elif update[0] == net_protocol.BOARD:
+                    scheduler.cancel_all()
+                    card_animations.clear()
+                    game_over, start_time = False, pygame.time.get_ticks()
+                    play_again_visible = False
+
+        profiler.mark('events')
+
+        ai_turn = ai_opponent is not None and game.current_player == ai_opponent.player and not game_over
+
+        # Process voice commands if in voice control mode; they wait in the queue during a reveal
+        if voice_control_mode and not animation_in_progress and not scheduler.pending('match') and not ai_turn:
+            process_voice_commands(scheduler, match_sound)
+
+        # The computer's picks are worked out on its own thread; ask for the next one once the last is shown
+        if ai_turn and not scheduler.pending('match'):
+            for index in ai_opponent.poll():
+                pick_card(game, index, AI, scheduler, match_sound)
+
+            if len(game.selected) < 2 and not game.is_complete:
+                ai_opponent.request_move()
+
+        profiler.mark('voice')
+
+        # Run deferred actions such as the match check once their delay is over
+        actions_ran = scheduler.run_due(pygame.time.get_ticks())
 
         # Time Attack mode logic
         if time_attack_mode and not game_over:
             current_time = pygame.time.get_ticks()
             if time_attack_start_time is None:
-                time_attack_start_time = current_time
+                time_attack_start_time = time_attack_began = current_time
             elapsed_time = (current_time - time_attack_start_time) // 1000
             remaining_time = time_attack_time_limit - elapsed_time
 
             if remaining_time <= 0:
                 game_over = True
+                end_time = current_time
+                if replay_writer is not None:
+                    replay_writer.record(GAME_OVER, value=game.turns)
+                finished_mode = MODE_TIME_ATTACK
+                if stats is not None:
+                    stats.record(stats_difficulty, MODE_TIME_ATTACK, False, current_time - time_attack_began,
+                                 game.turns, game.scores, time_attack_rounds, voice_control_mode, session_seed)
                 play_again_visible = True  # Show play again option
                 time_attack_mode = False  # Exit Time Attack mode
 
@@ -418,11 +682,13 @@ def run_game():
             play_again_visible = True
 
             if time_attack_mode:
-                if len(matched_cards) == len(cards):
+                if game.is_complete:
                     # Reset the game for Time Attack with a reduced time limit
                     time_attack_time_limit = max(10, time_attack_time_limit - time_attack_time_decrement)
-                    cards, selected_cards, matched_cards, game_over, start_time, current_player, scores = reset_game(
-                        colors, cols, rows)
+                    time_attack_rounds += 1
+                    scheduler.cancel_all()
+                    voice_commands.clear()
+                    game_over, start_time = reset_game(game)
                     time_attack_start_time = pygame.time.get_ticks()  # Restart the time attack timer
                     play_again_visible = False  # We're starting a new round, so hide the play again button
                 else:
@@ -431,31 +697,60 @@ def run_game():
             else:
                 # Regular mode game over handling
                 if num_players == 2:
-                    if scores[1] > scores[2]:
-                        message = f'Player 1 Wins with {scores[1]} Points!'
-                    elif scores[2] > scores[1]:
-                        message = f'Player 2 Wins with {scores[2]} Points!'
+                    if game.scores[1] > game.scores[2]:
+                        message = f'Player 1 Wins with {game.scores[1]} Points!'
+                    elif game.scores[2] > game.scores[1]:
+                        message = f'Player 2 Wins with {game.scores[2]} Points!'
                     else:  # Handle tie scenario
                         message = 'The game is a Tie!'
                 else:
-                    message = "Well done!" if len(matched_cards) == len(cards) else "Game Over!"
+                    message = "Well done!" if game.is_complete else "Game Over!"
+
+        profiler.mark('logic')
+
+        atlas.resize(view.card_width, view.card_height)  # Only rebuilds when zooming changed the card size
+
+        # Register the cards after the game logic, so a reset shows this frame
+        register_cards(renderer, game, view, hidden_color, card_animations, font, atlas)
 
-            if message:  # Display the game over message if it's set
-                display_game_over_message(screen, message, font, text_color, screen_width, screen_height)
+        if message:  # Display the game over message if it's set
+            renderer.region('message', game_over_message_box(message, font, screen_width, screen_height),
+                            message, lambda surface, rect, message=message: display_game_over_message(
+                                surface, message, font, text_color, screen_width, screen_height))
+
+            if stats is not None and finished_mode is not None:
+                # Read from the store's cache, which already holds the game that just ended
+                lines = leaderboard_lines(stats.top(stats_difficulty, finished_mode), finished_mode)
+                leaderboard_rect = pygame.Rect(0, 0, 280, font.get_linesize() * len(lines) + 10)
+                leaderboard_rect.midtop = (screen_width // 2, (screen_height + 100) // 2 + 10)
+                renderer.region('leaderboard', leaderboard_rect, lines,
+                                lambda surface, rect, lines=lines: draw_leaderboard(surface, rect, lines, font,
+                                                                                    text_color))
+
+        profiler.mark('cards')
 
         # Draw UI elements like info bar, reset button, and timer
-        pygame.draw.rect(screen, info_bar_color, (0, 0, screen_width, info_bar_height))
-        pygame.draw.rect(screen, button_color, reset_button_rect)
-        screen.blit(reset_text,
-                    (reset_button_rect.x + button_padding_horizontal, reset_button_rect.y + button_padding_vertical))
+        renderer.region('info_bar', (0, 0, screen_width, info_bar_height), info_bar_color,
+                        lambda surface, rect: pygame.draw.rect(surface, info_bar_color, rect))
+        renderer.region('reset_button', reset_button_rect, None,
+                        lambda surface, rect: draw_button(surface, rect, reset_text, button_color,
+                                                          button_padding_horizontal, button_padding_vertical))
 
         # Timer logic and rendering in the info bar
         current_time = pygame.time.get_ticks()
 
-        if len(matched_cards) == len(cards) and not game_over:  # Check if all cards have been matched
+        if game.is_complete and not game_over:  # Check if all cards have been matched
             game_over = True
+            if replay_writer is not None:
+                replay_writer.record(GAME_OVER, value=game.turns)
             end_time = current_time  # Capture end time at the moment game ends
+            if not time_attack_mode:  # Time Attack rounds are recorded once time runs out
+                finished_mode = MODE_VERSUS if num_players == 2 else MODE_SINGLE
+                if stats is not None:
+                    stats.record(stats_difficulty, finished_mode, True, end_time - start_time, game.turns,
+                                 game.scores, voice=voice_control_mode, seed=session_seed)
             play_again_visible = True
+            actions_ran += 1  # The game over screen shows from the next frame on
 
         if not game_over:
             elapsed_time = (current_time - start_time) // 1000
@@ -468,37 +763,102 @@ def run_game():
         timer_minutes = elapsed_time // 60
         timer_seconds = elapsed_time % 60
         timer_text = f'{timer_minutes:02}:{timer_seconds:02}'
-        timer_surface = font.render(timer_text, True, text_color, info_bar_color)
+        timer_surface = text_cache.render_digits(font, timer_text, text_color, info_bar_color)
         timer_rect = timer_surface.get_rect(center=((screen_width // 2), (info_bar_height // 2) + 25))
-        screen.blit(timer_surface, timer_rect)
+        renderer.region('timer', timer_rect, timer_text,
+                        lambda surface, rect, timer_surface=timer_surface: surface.blit(timer_surface, rect))
 
         if play_again_visible:
-            pygame.draw.rect(screen, button_color, play_again_button_rect)
-            screen.blit(play_again_text, (
-                play_again_button_rect.x + button_padding_horizontal,
-                play_again_button_rect.y + button_padding_vertical))
-
-        # Display scores and current player's turn for 2 Player mode
-        if num_players == 2:
-            display_text(screen, f"Player 1: {scores[1]} - Player 2: {scores[2]}", font, text_color, (10, 10))
-            display_text(screen, f"Player {current_player}'s Turn", font, text_color, (screen_width - 220, 10))
-
-        to_remove = []
-
-        for index, animation in card_animations.items():
-            animation['progress'] += 0.01  # Adjust speed as needed
-
-            if animation['progress'] >= 1:
-                to_remove.append(index)
-            else:
-                if animation['progress'] >= 0.5 and 'color' not in animation or animation['color'] is hidden_color:
-                    animation['color'] = cards[index]  # Switch to card's color at the halfway point
-
-        for index in to_remove:
-            card_animations.pop(index, None)
-
-        pygame.display.flip()
-        clock.tick(60)  # Maintain a steady frame rate
+            renderer.region('play_again_button', play_again_button_rect, None,
+                            lambda surface, rect: draw_button(surface, rect, play_again_text, button_color,
+                                                              button_padding_horizontal, button_padding_vertical))
+
+        # Display scores and current player's turn in multiplayer modes
+        if num_players > 1:
+            score_text = " - ".join(f"Player {player}: {score}" for player, score in game.scores.items())
+            turn_text = f"Player {game.current_player}'s Turn"
+            if ai_opponent is not None and game.current_player == ai_opponent.player:
+                turn_text = "Computer's Turn"
+            elif remote_game is not None:
+                if remote_game.error is not None:
+                    turn_text = "Disconnected"
+                elif remote_game.seated < num_players:
+                    turn_text = "Waiting for players"
+                elif game.current_player == remote_game.player:
+                    turn_text = "Your Turn"
+            renderer.region('score', pygame.Rect((10, 10), font.size(score_text)), score_text,
+                            lambda surface, rect, text=score_text: display_text(surface, text, font, text_color,
+                                                                                rect.topleft))
+            renderer.region('turn', pygame.Rect((screen_width - 220, 10), font.size(turn_text)), turn_text,
+                            lambda surface, rect, text=turn_text: display_text(surface, text, font, text_color,
+                                                                               rect.topleft))
+
+        # Show whether the shared voice model is ready in Voice Control mode
+        if voice_control_mode:
+            voice_text = voice_engine.status_text()
+            renderer.region('voice_status', pygame.Rect((10, 10), font.size(voice_text)), voice_text,
+                            lambda surface, rect, text=voice_text: display_text(surface, text, font, text_color,
+                                                                                rect.topleft))
+
+        if overlay_visible:
+            if pygame.time.get_ticks() >= overlay_refresh_at:
+                overlay_lines = tuple(profiler.overlay_lines())  # Refreshed twice a second to stay readable
+                overlay_refresh_at = pygame.time.get_ticks() + 500
+            line_height = overlay_font.get_linesize()
+            overlay_rect = pygame.Rect(0, 0, 230, line_height * len(overlay_lines) + 10)
+            overlay_rect.bottomright = (screen_width - 5, screen_height - 5)
+            renderer.region('profiler_overlay', overlay_rect, overlay_lines,
+                            lambda surface, rect, lines=overlay_lines: draw_profiler_overlay(surface, rect, lines,
+                                                                                             overlay_font))
+
+        profiler.mark('hud')
+        renderer.present()  # Push only the regions that changed this frame
+        profiler.mark('present')
+
+        # Keep the full frame rate only while something is changing; otherwise sleep until input or the next
+        # deadline (a scheduled action, the timer's next second, or the next voice model status check)
+        busy = bool(events or actions_ran or card_animations or len(voice_commands))
+        deadlines = [scheduler.next_due()]
+        if not game_over:
+            deadlines.append(start_time + (elapsed_time + 1) * 1000)
+            if time_attack_mode and time_attack_start_time is not None:
+                deadlines.append(time_attack_start_time + (pygame.time.get_ticks() - time_attack_start_time)
+                                 // 1000 * 1000 + 1000)
+        if voice_control_mode and voice_engine.state == LOADING:
+            deadlines.append(pygame.time.get_ticks() + 250)
+        if overlay_visible:
+            deadlines.append(overlay_refresh_at)
+        if replay_next is not None:
+            deadlines.append(replay_started + replay_next.tick)
+        pacer.pace(busy, min((deadline for deadline in deadlines if deadline is not None), default=None))
+        profiler.mark('wait')
+        profiler.end_frame()
+
+    profiler.close()
+    if replay_writer is not None:
+        replay_writer.close()
+        print(f"Session recorded to {replay_writer.path}")
+    if replay is not None:
+        replay.close()
+    if stats is not None:
+        stats.close()  # Writes the results still queued
+    if ai_opponent is not None:
+        ai_opponent.close()
+    if remote_game is not None:
+        if remote_game.error is not None:
+            print(f"Connection: {remote_game.error}")
+        remote_game.close()
+
+    if options.render_stats:
+        print(f"Render stats: {renderer.report()}")
+        print(f"Text cache stats: {text_cache.stats()}")
+        print(f"Frame pacing: {pacer.report()}")
+
+    if options.voice_stats:
+        print(f"Voice latency: {latency_summary(voice_latencies)}")
+        print(f"Voice commands: {voice_commands.stats()}")
+        if voice_session is not None:
+            print(f"Voice audio: {voice_session.stats()}")
 
     pygame.quit()
 
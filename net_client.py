@@ -0,0 +1,179 @@
+import asyncio
+import struct
+import threading
+from collections import deque
+
+from net_protocol import (BOARD, DELTA, DELTA_HEADER, HIDE, JOIN, JOIN_HEADER, MATCH, NEW_BOARD, PICK, PICK_BODY,
+                          REFUSED, REVEAL, SCORE, SEATS, TURN, WELCOME, WELCOME_HEADER, decode_events, encode_message,
+                          read_message)
+
+
+class RemoteGame:
+    """
+    A player's view of a game that lives on a net_server. It has the attributes of MemoryGame the game loop
+    draws from, but picks and new boards are only sent to the server; the board changes once the server's
+    delta updates are applied with apply_updates(). The connection runs on its own thread with an asyncio
+    event loop, so the game loop never waits on the network.
+    """
+
+    def __init__(self, host, port, room, cols, rows, timeout=5.0, on_update=None):
+        self.on_update = on_update  # Called on the network thread when updates arrive, e.g. to wake the game loop
+        self.player = None
+        self.num_players = None
+        self.cols = cols
+        self.rows = rows
+        self.faces = ()  # Set by the front end once it knows the board size
+        self.seated = 0
+        self.error = None  # Why the connection failed or closed, if it did
+        self.updates = deque()  # Event lists; appended by the network thread, applied by the game loop
+        self._clear(cols, rows)
+
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._writer = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop.run_until_complete,
+                                        args=(self._run(host, port, room, cols, rows),), name='net-client')
+        self._thread.daemon = True
+        self._thread.start()
+
+        if not self._ready.wait(timeout):
+            self.close()
+            raise ConnectionError(f"no answer from {host}:{port} within {timeout}s")
+        if self.error is not None:
+            raise ConnectionError(self.error)
+
+    def _clear(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.known = {}  # Card index -> face id of every card the server has shown on this board
+        self.matched = bytearray(cols * rows)
+        self.selected = []
+        self.scores = {player: 0 for player in range(1, (self.num_players or 1) + 1)}
+        self.current_player = 1
+        self.matched_count = 0
+        self.turns = 0
+
+    async def _run(self, host, port, room, cols, rows):
+        try:
+            reader, self._writer = await asyncio.open_connection(host, port)
+            self._writer.write(encode_message(JOIN, JOIN_HEADER.pack(cols, rows) + room.encode('utf-8')))
+
+            message = await read_message(reader)
+            if message is None or message[0] not in (WELCOME, REFUSED):
+                self.error = f"{host}:{port} is not a Memory Game server"
+                return
+            if message[0] == REFUSED:
+                self.error = message[1].decode('utf-8', 'replace')
+                return
+
+            self.player, self.num_players, cols, rows = WELCOME_HEADER.unpack_from(message[1])
+            self._clear(cols, rows)
+            self.updates.append(decode_events(message[1], WELCOME_HEADER.size))
+            self._ready.set()
+
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    if not self._closed:
+                        self.error = "the server closed the connection"
+                    break
+                if message[0] == DELTA:
+                    self.updates.append(decode_events(message[1], DELTA_HEADER.size))
+                    if self.on_update is not None:
+                        self.on_update()
+        except OSError as error:
+            self.error = f"cannot reach {host}:{port}: {error}"
+        except (KeyError, struct.error):
+            self.error = f"{host}:{port} sent an update this client does not understand"
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            if self._ready.is_set() and self.on_update is not None:
+                self.on_update()
+            self._ready.set()
+
+    def _send(self, message):
+        if self._writer is not None and self.error is None:
+            self._loop.call_soon_threadsafe(self._writer.write, message)
+
+    def apply_updates(self):
+        """
+        Applies the updates received since the last call and returns their events, so the front end can
+        animate what changed.
+        """
+        applied = []
+
+        while self.updates:
+            events = self.updates.popleft()
+            for event in events:
+                kind = event[0]
+                if kind == REVEAL:
+                    _, index, face, _ = event
+                    self.known[index] = face
+                    if index not in self.selected:
+                        self.selected.append(index)
+                elif kind == MATCH:
+                    _, first, second, face = event
+                    self.known[first] = self.known[second] = face
+                    self.matched[first] = self.matched[second] = 1
+                    self.matched_count += 2
+                    self.selected = [index for index in self.selected if index not in (first, second)]
+                    self.turns += 1
+                elif kind == HIDE:
+                    self.selected = [index for index in self.selected if index not in event[1:]]
+                    self.turns += 1
+                elif kind == SCORE:
+                    self.scores[event[1]] = event[2]
+                elif kind == TURN:
+                    self.current_player = event[1]
+                elif kind == BOARD:
+                    self._clear(event[1], event[2])
+                elif kind == SEATS:
+                    self.seated = event[1]
+            applied.extend(events)
+
+        return applied
+
+    def __len__(self):
+        return len(self.matched)
+
+    def face(self, index):
+        return self.faces[self.known[index]]
+
+    def is_matched(self, index):
+        return self.matched[index] == 1
+
+    def is_selected(self, index):
+        return index in self.selected
+
+    def select(self, index):
+        """
+        Asks the server to turn over the card at index. Always returns False: the card is only turned once
+        the server's REVEAL arrives.
+        """
+        if 0 <= index < len(self.matched) and self.current_player == self.player and self.seated == self.num_players:
+            self._send(encode_message(PICK, PICK_BODY.pack(index)))
+
+        return False
+
+    def reset(self, seed=None):
+        """
+        Asks the server for a new board and clears this copy right away; the server shuffles, so seed is
+        ignored.
+        """
+        self._send(encode_message(NEW_BOARD))
+        self._clear(self.cols, self.rows)
+
+    @property
+    def pair_selected(self):
+        return len(self.selected) == 2
+
+    @property
+    def is_complete(self):
+        return self.matched_count == len(self.matched)
+
+    def close(self):
+        self._closed = True
+        if self._writer is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._writer.close)
@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import random
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from net_protocol import (BOARD, DELTA, DELTA_HEADER, HIDE, JOIN, JOIN_HEADER, MATCH, NEW_BOARD, PICK, PICK_BODY,
+                          REVEAL, SEATS, TURN, WELCOME, WELCOME_HEADER, decode_events, encode_message, read_message)
+
+
+class SimulatedPlayer:
+    """
+    One player of the load test. It keeps its own copy of the board from the server's updates and, on its
+    turn, picks a card after think seconds: a card that completes a pair it has already seen, otherwise a
+    card it has not seen yet. Latency is measured from sending a pick to receiving the REVEAL for it.
+    """
+
+    def __init__(self, room, cols, rows, think, rng, stats):
+        self.room = room
+        self.cols = cols
+        self.rows = rows
+        self.think = think
+        self.rng = rng
+        self.stats = stats
+        self.player = None
+        self.seats = None
+        self.writer = None
+        self._scheduled = None  # Timer handle of the next pick
+        self._in_flight = None  # (index, send time) of the pick waiting for its REVEAL
+        self.new_board(cols, rows)
+
+    def new_board(self, cols, rows):
+        self.cards = cols * rows
+        self.known = {}  # index -> face of unmatched cards seen on this board
+        self.seen = {}  # face -> unmatched indices seen with it
+        self.unknown = set(range(self.cards))
+        self.selected = []
+        self.matched_count = 0
+        self.current_player = 1
+        self.seated = 0
+        self._in_flight = None
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+
+    async def run(self, host, port, start_delay, until):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(start_delay)  # Connections are spread out instead of hitting the listen backlog at once
+
+        try:
+            reader, self.writer = await asyncio.open_connection(host, port)
+        except OSError:
+            self.stats['failed'] += 1
+            return
+        self.writer.write(encode_message(JOIN, JOIN_HEADER.pack(self.cols, self.rows) + self.room.encode('utf-8')))
+
+        message = await read_message(reader)
+        if message is None or message[0] != WELCOME:
+            self.stats['failed'] += 1
+            self.writer.close()
+            return
+
+        self.player, self.seats, cols, rows = WELCOME_HEADER.unpack_from(message[1])
+        self.new_board(cols, rows)
+        self.apply(decode_events(message[1], WELCOME_HEADER.size))
+
+        while loop.time() < until:
+            try:
+                message = await asyncio.wait_for(read_message(reader), until - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if message is None:
+                self.stats['disconnected'] += 1
+                break
+            if message[0] == DELTA:
+                self.stats['deltas'] += 1
+                self.apply(decode_events(message[1], DELTA_HEADER.size))
+
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+        self.writer.close()
+
+    def apply(self, events):
+        for event in events:
+            kind = event[0]
+            if kind == REVEAL:
+                _, index, face, _ = event
+                if self._in_flight is not None and self._in_flight[0] == index:
+                    self.stats['latencies'].append(time.perf_counter() - self._in_flight[1])
+                    self._in_flight = None
+                if index not in self.known:
+                    self.known[index] = face
+                    self.seen.setdefault(face, []).append(index)
+                    self.unknown.discard(index)
+                self.selected.append(index)
+            elif kind == MATCH:
+                _, first, second, face = event
+                for index in (first, second):
+                    self.known.pop(index, None)
+                    self.unknown.discard(index)
+                self.seen.pop(face, None)
+                self.selected = []
+                self.matched_count += 2
+                if self.matched_count == self.cards:
+                    self.stats['boards'] += self.player == 1
+                    if self.player == 1:  # One player per room asks for the next board
+                        self.writer.write(encode_message(NEW_BOARD))
+            elif kind == HIDE:
+                self.selected = []
+            elif kind == TURN:
+                self.current_player = event[1]
+            elif kind == BOARD:
+                seated = self.seated
+                self.new_board(event[1], event[2])
+                self.seated = seated
+            elif kind == SEATS:
+                self.seated = event[1]
+
+        if (self.current_player == self.player and self.seated == self.seats and len(self.selected) < 2
+                and self._scheduled is None and self._in_flight is None and self.matched_count < self.cards):
+            # Jittered, so the players of different rooms do not all move in lockstep
+            self._scheduled = asyncio.get_running_loop().call_later(self.think * self.rng.uniform(0.5, 1.5),
+                                                                    self.pick)
+
+    def choose(self):
+        if self.selected:
+            face = self.known.get(self.selected[0])
+            partners = [index for index in self.seen.get(face, ()) if index != self.selected[0]]
+            if partners:
+                return partners[0]
+        else:
+            for indices in self.seen.values():
+                if len(indices) == 2:
+                    return indices[0]
+
+        candidates = self.unknown or set(self.known) - set(self.selected)
+        return self.rng.choice(tuple(candidates))
+
+    def pick(self):
+        self._scheduled = None
+        if self.writer.is_closing() or len(self.selected) == 2:
+            return
+
+        index = self.choose()
+        self._in_flight = (index, time.perf_counter())
+        self.stats['picks'] += 1
+        self.writer.write(encode_message(PICK, PICK_BODY.pack(index)))
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_load(host, port, rooms, seats, cols, rows, think, duration, ramp_up, seed):
+    rng = random.Random(seed)
+    stats = {'picks': 0, 'deltas': 0, 'boards': 0, 'failed': 0, 'disconnected': 0, 'latencies': []}
+    until = asyncio.get_running_loop().time() + ramp_up + duration
+    players = [SimulatedPlayer(f"load-{room}", cols, rows, think, random.Random(rng.getrandbits(64)), stats)
+               for room in range(rooms) for _ in range(seats)]
+
+    await asyncio.gather(*(player.run(host, port, ramp_up * number / len(players), until)
+                           for number, player in enumerate(players)))
+
+    return stats
+
+
+def wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1.0).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Load test a Memory Game server with simulated players')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rooms', type=int, default=100)
+    parser.add_argument('--seats', type=int, default=2, help='players per room, as the server was started with')
+    parser.add_argument('--cols', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--think', type=float, default=0.5, help='mean seconds a player takes per pick')
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds to measure once everyone connected')
+    parser.add_argument('--ramp-up', type=float, default=2.0, help='seconds over which the players connect')
+    parser.add_argument('--reveal-delay', type=float, default=0.5, help='reveal delay of the spawned server')
+    parser.add_argument('--spawn-server', action='store_true',
+                        help='start net_server.py for the test and measure its CPU time, for rooms per core')
+    parser.add_argument('--seed', type=int, default=None)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_arguments(sys.argv[1:] if argv is None else argv)
+    server = None
+
+    if options.spawn_server:
+        server = subprocess.Popen([sys.executable, 'net_server.py', '--host', options.host, '--port', str(options.port),
+                                   '--seats', str(options.seats), '--reveal-delay', str(options.reveal_delay)],
+                                  stdout=subprocess.PIPE, text=True)
+        wait_for_port(options.host, options.port)
+
+    started = time.perf_counter()
+    client_cpu = time.process_time()
+    stats = asyncio.run(run_load(options.host, options.port, options.rooms, options.seats, options.cols,
+                                 options.rows, options.think, options.duration, options.ramp_up, options.seed))
+    elapsed = time.perf_counter() - started
+    client_cpu = time.process_time() - client_cpu
+
+    latencies = sorted(stats['latencies'])
+    print(f"{options.rooms} rooms, {options.rooms * options.seats} players, {elapsed:.1f}s "
+          f"({stats['failed']} failed to join, {stats['disconnected']} disconnected)")
+    print(f"picks: {stats['picks']} ({stats['picks'] / elapsed:.0f}/s), deltas received: {stats['deltas']} "
+          f"({stats['deltas'] / elapsed:.0f}/s), boards cleared: {stats['boards']}")
+    if latencies:
+        print(f"pick latency: p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+              f"max {latencies[-1] * 1000:.2f} ms")
+    print(f"load test client CPU: {client_cpu:.2f}s")
+
+    if server is not None:
+        server.send_signal(signal.SIGINT)
+        print(f"server: {server.communicate()[0].strip().splitlines()[-1]}")
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        server_cpu = usage.ru_utime + usage.ru_stime
+        print(f"server CPU: {server_cpu:.2f}s, {server_cpu / elapsed:.1%} of a core "
+              f"=> ~{options.rooms * elapsed / max(server_cpu, 1e-9):,.0f} rooms per core at this pace")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import struct
+
+# Every message is a 4-byte little-endian length followed by the payload, whose first byte is its type
+LENGTH = struct.Struct('<I')
+MAX_MESSAGE = 1 << 24
+
+# Client to server
+JOIN = 1  # cols, rows (used if the room is new), then the room name in UTF-8
+PICK = 2  # card index
+NEW_BOARD = 3  # ask for a new board
+
+# Server to client
+WELCOME = 10  # player number, seats, cols, rows, then the current board as events
+DELTA = 11  # sequence number, then events
+REFUSED = 12  # reason in UTF-8
+
+JOIN_HEADER = struct.Struct('<HH')
+PICK_BODY = struct.Struct('<I')
+WELCOME_HEADER = struct.Struct('<BBHH')
+DELTA_HEADER = struct.Struct('<I')
+
+# Events of a delta; a client that applies them in order has the same board as the server
+REVEAL = 1  # index, face, player: a card was turned over
+MATCH = 2  # first, second, face: a pair was taken off the board
+HIDE = 3  # first, second: a missed pair was turned face down again
+SCORE = 4  # player, score
+TURN = 5  # player whose turn it is
+BOARD = 6  # cols, rows: a new board with every card face down and all scores at 0
+SEATS = 7  # number of players in the room
+
+EVENTS = {
+    REVEAL: struct.Struct('<IHB'),
+    MATCH: struct.Struct('<IIH'),
+    HIDE: struct.Struct('<II'),
+    SCORE: struct.Struct('<BH'),
+    TURN: struct.Struct('<B'),
+    BOARD: struct.Struct('<HH'),
+    SEATS: struct.Struct('<B'),
+}
+
+
+def encode_message(kind, body=b''):
+    return LENGTH.pack(len(body) + 1) + bytes((kind,)) + body
+
+
+def encode_events(events):
+    """
+    Packs (event, *fields) tuples into the body of a delta.
+    """
+    return b''.join(bytes((event[0],)) + EVENTS[event[0]].pack(*event[1:]) for event in events)
+
+
+def decode_events(body, offset=0):
+    """
+    Unpacks the events of a delta body starting at offset into (event, *fields) tuples.
+    """
+    events = []
+
+    while offset < len(body):
+        kind = body[offset]
+        layout = EVENTS[kind]
+        events.append((kind,) + layout.unpack_from(body, offset + 1))
+        offset += 1 + layout.size
+
+    return events
+
+
+async def read_message(reader, max_length=MAX_MESSAGE):
+    """
+    Reads one message from an asyncio stream. Returns (type, body), or None once the stream is closed or
+    the peer sent something that is not a message.
+    """
+    try:
+        length, = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+        if length > max_length:
+            return None
+        payload = await reader.readexactly(length)
+    except (EOFError, ConnectionError):
+        return None
+
+    if not payload:  # Every message has at least its type
+        return None
+
+    return payload[0], payload[1:]
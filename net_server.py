@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import signal
+import sys
+import time
+
+from game_core import MemoryGame
+from net_protocol import (BOARD, DELTA, DELTA_HEADER, HIDE, JOIN, JOIN_HEADER, MATCH, NEW_BOARD, PICK, PICK_BODY,
+                          REFUSED, REVEAL, SCORE, SEATS, TURN, WELCOME, WELCOME_HEADER, encode_events, encode_message,
+                          read_message)
+
+MAX_CARDS = 65536  # Largest board a client may ask for; faces are sent as 16-bit ids
+
+
+class Room:
+    """
+    One game with its seated players. The room's MemoryGame is the authoritative board; every change is
+    sent to all players as a single delta message, encoded once.
+    """
+
+    def __init__(self, name, cols, rows, seats, reveal_delay, stats):
+        self.name = name
+        self.game = MemoryGame(cols, rows, num_players=seats)
+        self.seats = seats
+        self.reveal_delay = reveal_delay
+        self.players = {}  # player number -> StreamWriter
+        self.sequence = 0
+        self.stats = stats
+        self._resolving = None  # Timer handle of the pending match check
+
+    def join(self, writer):
+        """
+        Seats writer and returns its player number, or None if the room is full.
+        """
+        free = [player for player in range(1, self.seats + 1) if player not in self.players]
+        if not free:
+            return None
+
+        self.players[free[0]] = writer
+        self.broadcast([(SEATS, len(self.players))], exclude=free[0])
+
+        return free[0]
+
+    def leave(self, player):
+        self.players.pop(player, None)
+        self.broadcast([(SEATS, len(self.players))])
+
+    def snapshot(self):
+        """
+        Returns the events that bring a client from nothing to the current board.
+        """
+        game = self.game
+        events = [(BOARD, game.cols, game.rows)]
+        matched = {}
+
+        for index, flag in enumerate(game.matched):
+            if flag:
+                matched.setdefault(game.board[index], []).append(index)
+        events.extend((MATCH, first, second, face) for face, (first, second) in matched.items())
+        events.extend((REVEAL, index, game.board[index], game.current_player) for index in game.selected)
+        events.extend((SCORE, player, score) for player, score in game.scores.items())
+        events.append((TURN, game.current_player))
+        events.append((SEATS, len(self.players)))
+
+        return events
+
+    def pick(self, player, index):
+        """
+        Turns over a card for player if it is their turn, every seat is taken and the move is allowed.
+        """
+        game = self.game
+        if len(self.players) < self.seats or player != game.current_player or not game.select(index):
+            self.stats['rejected'] += 1
+            return
+
+        self.broadcast([(REVEAL, index, game.board[index], player)])
+
+        if game.pair_selected:
+            self._resolving = asyncio.get_running_loop().call_later(self.reveal_delay, self.resolve)
+
+    def resolve(self):
+        game = self.game
+        self._resolving = None
+        first, second = game.selected
+        player = game.current_player
+        face = game.board[first]
+
+        if game.resolve():
+            events = [(MATCH, first, second, face), (SCORE, player, game.scores[player])]
+        else:
+            events = [(HIDE, first, second)]
+        events.append((TURN, game.current_player))
+
+        self.broadcast(events)
+
+    def new_board(self):
+        if self._resolving is not None:
+            self._resolving.cancel()
+            self._resolving = None
+
+        self.game.reset()
+        self.broadcast([(BOARD, self.game.cols, self.game.rows), (TURN, self.game.current_player)])
+
+    def broadcast(self, events, exclude=None):
+        self.sequence += 1
+        message = encode_message(DELTA, DELTA_HEADER.pack(self.sequence) + encode_events(events))
+
+        for player, writer in self.players.items():
+            if player != exclude and not writer.is_closing():
+                writer.write(message)
+                self.stats['deltas'] += 1
+                self.stats['bytes_out'] += len(message)
+
+    def close(self):
+        if self._resolving is not None:
+            self._resolving.cancel()
+
+
+class GameServer:
+    """
+    Runs any number of rooms in one asyncio event loop. Clients join a room by name; the first one to
+    join a room picks its board size.
+    """
+
+    def __init__(self, seats=2, reveal_delay=0.5):
+        self.seats = seats
+        self.reveal_delay = reveal_delay
+        self.rooms = {}
+        self.connections = set()  # Tasks of the connected clients, so shutdown can wait for them
+        self.stats = {'connections': 0, 'picks': 0, 'rejected': 0, 'deltas': 0, 'bytes_out': 0}
+
+    async def handle(self, reader, writer):
+        message = await read_message(reader, max_length=1024)
+        if message is None or message[0] != JOIN or len(message[1]) < JOIN_HEADER.size:
+            writer.close()
+            return
+
+        cols, rows = JOIN_HEADER.unpack_from(message[1])
+        name = message[1][JOIN_HEADER.size:].decode('utf-8', 'replace')
+        room = self.rooms.get(name)
+        if room is None:
+            if cols < 1 or rows < 1 or cols * rows % 2 or cols * rows > MAX_CARDS:
+                writer.write(encode_message(REFUSED, f"{cols}x{rows} is not a valid board".encode()))
+                writer.close()
+                return
+            room = self.rooms[name] = Room(name, cols, rows, self.seats, self.reveal_delay, self.stats)
+
+        player = room.join(writer)
+        if player is None:
+            writer.write(encode_message(REFUSED, f"room {name} is full".encode()))
+            writer.close()
+            return
+
+        self.stats['connections'] += 1
+        self.connections.add(asyncio.current_task())
+        game = room.game
+        writer.write(encode_message(WELCOME, WELCOME_HEADER.pack(player, room.seats, game.cols, game.rows)
+                                    + encode_events(room.snapshot())))
+
+        try:
+            while True:
+                message = await read_message(reader, max_length=64)
+                if message is None:
+                    break
+
+                kind, body = message
+                if kind == PICK and len(body) == PICK_BODY.size:
+                    self.stats['picks'] += 1
+                    room.pick(player, PICK_BODY.unpack(body)[0])
+                elif kind == NEW_BOARD:
+                    room.new_board()
+
+                await writer.drain()  # Stop reading from a client that does not keep up with its deltas
+        except ConnectionError:
+            pass
+        finally:
+            room.leave(player)
+            if not room.players:
+                room.close()
+                del self.rooms[name]
+            writer.close()
+            self.connections.discard(asyncio.current_task())
+
+    async def serve(self, host, port, stats_interval=None):
+        """
+        Serves until SIGINT or SIGTERM, then disconnects every client.
+        """
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except NotImplementedError:  # Windows; Ctrl+C still ends the server through KeyboardInterrupt
+                pass
+
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}", flush=True)
+
+        async with server:
+            if stats_interval:
+                loop.create_task(self.report(stats_interval))
+            await stop.wait()
+
+        # Closing the clients ends their read loops, so every handler finishes instead of being cancelled
+        for room in self.rooms.values():
+            for writer in room.players.values():
+                writer.close()
+        await asyncio.gather(*self.connections)
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.report_line(), flush=True)
+
+    def report_line(self):
+        return (f"{len(self.rooms)} rooms, {sum(len(room.players) for room in self.rooms.values())} players, "
+                f"{time.process_time():.1f}s CPU, " + ", ".join(f"{key} {value}" for key, value in self.stats.items()))
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Memory Game server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seats', type=int, default=2, help='players per room')
+    parser.add_argument('--reveal-delay', type=float, default=0.5,
+                        help='seconds a picked pair stays face up before it is checked')
+    parser.add_argument('--stats-interval', type=float, default=None, help='print server statistics every N seconds')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_arguments(sys.argv[1:] if argv is None else argv)
+    server = GameServer(options.seats, options.reveal_delay)
+
+    try:
+        asyncio.run(server.serve(options.host, options.port, options.stats_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(server.report_line(), flush=True)
+
+
+if __name__ == "__main__":
+    main()
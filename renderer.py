@@ -0,0 +1,132 @@
+import pygame
+
+FULL_REDRAW_SHARE = 0.5  # Share of the screen damaged above which present() repaints all of it
+
+
+class DirtyRenderer:
+    """
+    Retained-mode render layer. Every frame the game registers the regions it wants on screen
+    (cards, timer, score line, buttons...) together with a small state value describing what the
+    region looks like. Only regions whose state or rect changed since the previous frame, plus
+    regions that disappeared, are repainted and pushed with pygame.display.update(rects).
+    screen may be a sub-surface of the display, in which case regions are in the sub-surface's coordinates.
+    """
+
+    def __init__(self, screen, bg_color):
+        self.screen = screen
+        self.bg_color = bg_color
+        self.offset = screen.get_abs_offset()  # Where the surface sits on the display, (0, 0) for the display
+        self._retained = {}  # key -> (rect, state) as presented last frame
+        self._frame = []  # [(key, rect, state, draw)] registered for the current frame
+        self._full_redraw = True
+
+        # Per-frame and cumulative statistics
+        self.frame_rects = 0
+        self.frame_pixels = 0
+        self.frames = 0
+        self.total_rects = 0
+        self.total_pixels = 0
+
+    def invalidate(self):
+        """
+        Forces the next present() to repaint the whole screen, e.g. after a menu drew over it.
+        """
+        self._full_redraw = True
+
+    def region(self, key, rect, state, draw):
+        """
+        Registers a region for the current frame. draw(screen, rect) paints it; state must be a
+        comparable value that changes whenever the region's appearance changes.
+        Regions are painted in registration order, so later regions are drawn on top.
+        """
+        self._frame.append((key, pygame.Rect(rect), state, draw))
+
+    def present(self):
+        """
+        Repaints the damaged parts of the screen and pushes them to the display.
+        Returns the list of rects that were updated.
+        """
+        frame, self._frame = self._frame, []
+        screen_rect = self.screen.get_rect()
+
+        if self._full_redraw:
+            damage = [screen_rect]
+            self._full_redraw = False
+        else:
+            damage = []
+            current_keys = set()
+
+            for key, rect, state, _ in frame:
+                current_keys.add(key)
+                previous = self._retained.get(key)
+
+                if previous is None:
+                    damage.append(rect)
+                elif previous != (rect, state):
+                    damage.append(rect.union(previous[0]))
+
+            for key, (rect, _) in self._retained.items():
+                if key not in current_keys:
+                    damage.append(rect)
+
+            damage = [rect.clip(screen_rect) for rect in damage if rect.width and rect.height]
+            # Every damaged rect is checked against every region, so when most of the screen changed anyway
+            # (scrolling, zooming) one full repaint is cheaper than merging and painting many small rects
+            if sum(rect.width * rect.height for rect in damage) > FULL_REDRAW_SHARE * screen_rect.width * \
+                    screen_rect.height:
+                damage = [screen_rect]
+            else:
+                damage = _merge_rects(damage)
+
+        for damaged in damage:
+            self.screen.set_clip(damaged)
+            self.screen.fill(self.bg_color, damaged)
+
+            for _, rect, _, draw in frame:
+                if rect.colliderect(damaged):
+                    draw(self.screen, rect)
+
+        self.screen.set_clip(None)
+
+        self._retained = {key: (rect, state) for key, rect, state, _ in frame}
+
+        if damage:
+            pygame.display.update([rect.move(self.offset) for rect in damage] if any(self.offset) else damage)
+
+        self.frame_rects = len(damage)
+        self.frame_pixels = sum(rect.width * rect.height for rect in damage)
+        self.frames += 1
+        self.total_rects += self.frame_rects
+        self.total_pixels += self.frame_pixels
+
+        return damage
+
+    def report(self):
+        """
+        Returns a one-line summary of how much of the screen was repainted compared to full flips.
+        """
+        full_frame_pixels = self.screen.get_width() * self.screen.get_height()
+        frames = max(1, self.frames)
+        ratio = self.total_pixels / (full_frame_pixels * frames)
+
+        return (f"{self.frames} frames, {self.total_rects / frames:.2f} rects/frame, "
+                f"{self.total_pixels / frames:.0f} pixels/frame ({ratio:.1%} of full-screen flips)")
+
+
+def _merge_rects(rects):
+    """
+    Collapses overlapping rects into their union so no pixel is painted or pushed twice.
+    """
+    merged = []
+
+    for rect in rects:
+        rect = rect.copy()
+        overlapping = rect.collidelist(merged)
+
+        while overlapping != -1:
+            rect.union_ip(merged.pop(overlapping))
+            overlapping = rect.collidelist(merged)
+
+        merged.append(rect)
+
+    return merged
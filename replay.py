@@ -0,0 +1,114 @@
+import argparse
+import sys
+import time
+
+from game_core import MemoryGame
+from replay_log import (GAME_OVER, MATCH, MISS, REJECTED, RESET, RESOLVE, SELECT, SELECTED, ReplayLog, np)
+
+
+def replay(log):
+    """
+    Plays a session log through the game engine as fast as possible, checking every recorded outcome.
+    Returns the engine in its final state and a list of (record number, message) for outcomes that differ.
+    """
+    game = MemoryGame(log.cols, log.rows, num_players=log.players)
+    divergences = []
+
+    for number, record in enumerate(log.records()):
+        if record.kind == RESET:
+            game.reset(record.value)
+        elif record.kind == SELECT:
+            outcome = SELECTED if game.select(record.value) else REJECTED
+            if outcome != record.outcome:
+                verb = 'selected' if outcome == SELECTED else 'rejected'
+                divergences.append((number, f"card {record.value + 1} was {verb}"))
+        elif record.kind == RESOLVE:
+            match = game.resolve()
+            if (MATCH if match else MISS) != record.outcome or game.turns != record.value:
+                divergences.append((number, f"turn {game.turns} was a {'match' if match else 'miss'}"))
+        elif record.kind == GAME_OVER and game.turns != record.value:
+            divergences.append((number, f"game over after {game.turns} turns instead of {record.value}"))
+
+    return game, divergences
+
+
+def scan(log):
+    """
+    Returns a summary of a session log without replaying it. With NumPy the records are counted as one
+    array straight from the memory map.
+    """
+    if np is not None:
+        records = log.array()
+        kinds, outcomes = records['kind'], records['outcome']
+        return {
+            'records': len(records),
+            'duration_ms': int(records['tick'][-1]) if len(records) else 0,
+            'boards': int(np.count_nonzero(kinds == RESET)),
+            'picks': int(np.count_nonzero(kinds == SELECT)),
+            'rejected': int(np.count_nonzero(outcomes == REJECTED)),
+            'matches': int(np.count_nonzero(outcomes == MATCH)),
+            'misses': int(np.count_nonzero(outcomes == MISS)),
+        }
+
+    summary = {'records': 0, 'duration_ms': 0, 'boards': 0, 'picks': 0, 'rejected': 0, 'matches': 0, 'misses': 0}
+    for record in log.records():
+        summary['records'] += 1
+        summary['duration_ms'] = record.tick
+        summary['boards'] += record.kind == RESET
+        summary['picks'] += record.kind == SELECT
+        summary['rejected'] += record.outcome == REJECTED
+        summary['matches'] += record.outcome == MATCH
+        summary['misses'] += record.outcome == MISS
+
+    return summary
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Check or summarize recorded game sessions; '
+                                                 'use memorygame.py --replay LOG to watch one')
+    parser.add_argument('command', choices=('check', 'scan'),
+                        help='check: replay each log headlessly and verify its outcomes; scan: summarize each log')
+    parser.add_argument('logs', nargs='+', metavar='LOG')
+    parser.add_argument('--quiet', action='store_true', help='only print problems and the totals')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_arguments(sys.argv[1:] if argv is None else argv)
+    started = time.perf_counter()
+    records = 0
+    failed = 0
+
+    for path in options.logs:
+        try:
+            log = ReplayLog(path)
+        except (OSError, ValueError) as error:
+            print(f"{path}: {error}")
+            failed += 1
+            continue
+
+        with log:
+            records += len(log)
+
+            if options.command == 'scan':
+                if not options.quiet:
+                    print(f"{path}: " + ", ".join(f"{key} {value}" for key, value in scan(log).items()))
+                continue
+
+            game, divergences = replay(log)
+            for number, message in divergences:
+                print(f"{path}: record {number}: {message}")
+            if divergences:
+                failed += 1
+            elif not options.quiet:
+                print(f"{path}: ok, {game.turns} turns, scores {game.scores}")
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(options.logs)} logs, {records} records in {elapsed:.2f}s, {failed} failed")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import mmap
+import struct
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # Logs are still read record by record without NumPy
+    np = None
+
+MAGIC = b'MGRL'
+VERSION = 1
+
+# Header: magic, version, cols, rows, players, flags, session seed (the resets draw their seeds from it)
+HEADER = struct.Struct('<4sHHHBBI')
+# Record: tick (ms since the session started), kind, source, outcome, value (card index or seed)
+RECORD = struct.Struct('<IBBBxI')
+
+# Record kinds
+RESET = 0  # A new board was shuffled; value is its seed
+SELECT = 1  # A card was picked; value is its index
+RESOLVE = 2  # The selected pair was checked; value is the game's turn count
+GAME_OVER = 3  # The board was cleared or time ran out; value is the game's turn count
+
+# Input sources
+SYSTEM = 0
+MOUSE = 1
+VOICE = 2
+AI = 3
+
+# Outcomes
+NONE = 0
+SELECTED = 1
+REJECTED = 2
+MATCH = 3
+MISS = 4
+
+# Session flags
+TIME_ATTACK = 1
+VOICE_CONTROL = 2
+
+Record = namedtuple('Record', ['tick', 'kind', 'source', 'outcome', 'value'])
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([('tick', '<u4'), ('kind', 'u1'), ('source', 'u1'), ('outcome', 'u1'), ('pad', 'u1'),
+                             ('value', '<u4')])
+
+
+class ReplayWriter:
+    """
+    Appends fixed-size binary records for one session to a log file. Records go through the file's write
+    buffer, which is flushed whenever a new board starts and when the log is closed.
+    """
+
+    def __init__(self, path, cols, rows, players, flags, seed, clock):
+        self.path = path
+        self.clock = clock  # Returns the current time in milliseconds, e.g. pygame.time.get_ticks
+        self.started = clock()
+        self.records = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, cols, rows, players, flags, seed))
+
+    def record(self, kind, source=SYSTEM, outcome=NONE, value=0):
+        self._file.write(RECORD.pack(self.clock() - self.started, kind, source, outcome, value))
+        self.records += 1
+
+        if kind == RESET:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ReplayLog:
+    """
+    A session log opened through a read-only memory map, so records are decoded straight from the page
+    cache without reading the file into memory first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as log_file:
+            self._map = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a replay log")
+
+        magic, version, self.cols, self.rows, self.players, self.flags, self.seed = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} replay log")
+
+        # A log cut short by a crash may end in a partial record, which is ignored
+        self._end = HEADER.size + (len(self._map) - HEADER.size) // RECORD.size * RECORD.size
+
+    def __len__(self):
+        return (self._end - HEADER.size) // RECORD.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def records(self):
+        """
+        Yields the session's records in order.
+        """
+        for fields in RECORD.iter_unpack(self._map[HEADER.size:self._end]):
+            yield Record(*fields)
+
+    def array(self):
+        """
+        Returns the records as a NumPy structured array; a copy, so it stays valid after close().
+        """
+        return np.frombuffer(self._map, dtype=RECORD_DTYPE, count=len(self), offset=HEADER.size).copy()
+
+    def close(self):
+        self._map.close()
@@ -0,0 +1,80 @@
+import heapq
+import itertools
+
+
+class ScheduledAction:
+    """
+    Handle for a deferred action; cancel() stops it from running.
+    """
+    __slots__ = ('due', 'callback', 'args', 'tag', 'cancelled')
+
+    def __init__(self, due, callback, args, tag):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.tag = tag
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Runs deferred actions from the main loop instead of blocking it with pygame.time.wait.
+    Times are in milliseconds on the same clock the caller passes to run_due (pygame.time.get_ticks()).
+    """
+
+    def __init__(self):
+        self._queue = []  # heap of (due, sequence, action)
+        self._sequence = itertools.count()
+
+    def call_later(self, now, delay, callback, *args, tag=None):
+        """
+        Schedules callback(*args) to run delay milliseconds after now and returns its handle.
+        """
+        action = ScheduledAction(now + delay, callback, args, tag)
+        heapq.heappush(self._queue, (action.due, next(self._sequence), action))
+
+        return action
+
+    def run_due(self, now):
+        """
+        Runs every action that is due at now, in the order they were due. Returns how many ran.
+        """
+        ran = 0
+
+        while self._queue and self._queue[0][0] <= now:
+            _, _, action = heapq.heappop(self._queue)
+
+            if not action.cancelled:
+                action.callback(*action.args)
+                ran += 1
+
+        return ran
+
+    def pending(self, tag=None):
+        """
+        Returns True if an action (optionally with the given tag) is still waiting to run.
+        """
+        return any(not action.cancelled and (tag is None or action.tag == tag) for _, _, action in self._queue)
+
+    def next_due(self):
+        """
+        Returns the time the next live action is due, or None if nothing is scheduled.
+        """
+        while self._queue and self._queue[0][2].cancelled:
+            heapq.heappop(self._queue)
+
+        return self._queue[0][0] if self._queue else None
+
+    def cancel_all(self, tag=None):
+        """
+        Cancels every pending action, or only the ones with the given tag.
+        """
+        for _, _, action in self._queue:
+            if tag is None or action.tag == tag:
+                action.cancel()
+
+        if tag is None:
+            self._queue.clear()
@@ -0,0 +1,219 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from game_core import MemoryGame
+from strategies import STRATEGIES
+
+try:
+    import numpy as np
+except ImportError:  # The pure Python path works without NumPy
+    np = None
+
+
+def play_game(game, strategies):
+    """
+    Plays one game to completion on an already reset board; strategies[i] plays for player i + 1 and every
+    strategy observes each card that is turned over. Returns the number of turns taken.
+    """
+    for strategy in strategies:
+        strategy.reset(game)
+
+    while not game.is_complete:
+        strategy = strategies[game.current_player - 1]
+
+        for _ in range(2):
+            index = strategy.pick(game)
+            if not game.select(index):
+                raise RuntimeError(f"{type(strategy).__name__} picked card {index}, which cannot be selected")
+
+            for observer in strategies:
+                observer.observe(game, index)
+
+        game.resolve()
+
+    return game.turns
+
+
+def simulate(cols, rows, strategy='perfect', games=1000, seed=None, num_players=1):
+    """
+    Plays games seeded games with the pure Python engine and returns a summary of the results.
+    """
+    rng = random.Random(seed)
+    game = MemoryGame(cols, rows, num_players=num_players, seed=rng.getrandbits(64))
+    strategies = [STRATEGIES[strategy](random.Random(rng.getrandbits(64))) for _ in range(num_players)]
+    turns = []
+    wins = [0] * (num_players + 1)  # Index 0 counts ties
+
+    for _ in range(games):
+        game.reset()
+        turns.append(play_game(game, strategies))
+
+        if num_players > 1:
+            best = max(game.scores.values())
+            leaders = [player for player, score in game.scores.items() if score == best]
+            wins[leaders[0] if len(leaders) == 1 else 0] += 1
+
+    return _summary(turns, wins, num_players)
+
+
+def simulate_numpy(cols, rows, strategy='perfect', games=1000, seed=None, num_players=1, batch_size=100000):
+    """
+    Vectorized version of simulate() for the random and perfect-memory strategies: every game in a batch
+    advances one turn per NumPy step. Returns the same summary as simulate().
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for the vectorized simulator")
+
+    steps = {'random': _random_turns, 'perfect': _perfect_turns}
+    if strategy not in steps:
+        raise ValueError(f"The vectorized simulator only plays the {' and '.join(steps)} strategies")
+    step = steps[strategy]
+    rng = np.random.default_rng(seed)
+    turns = []
+    wins = np.zeros(num_players + 1, dtype=np.int64)
+
+    for start in range(0, games, batch_size):
+        count = min(batch_size, games - start)
+        batch_turns, scores = step(_partners(rng, count, cols * rows), rng, num_players)
+        turns.append(batch_turns)
+
+        if num_players > 1:
+            wins[1] += np.count_nonzero(scores[:, 0] > scores[:, 1])
+            wins[2] += np.count_nonzero(scores[:, 1] > scores[:, 0])
+            wins[0] += np.count_nonzero(scores[:, 0] == scores[:, 1])
+
+    return _summary(np.concatenate(turns) if turns else np.zeros(0), wins.tolist(), num_players)
+
+
+def _partners(rng, count, cards):
+    """
+    Shuffles count boards at once and returns, for every card position, the position of its pair.
+    """
+    positions = rng.random((count, cards)).argsort(axis=1)  # Cards 2f and 2f + 1 share face f
+    partner = np.empty_like(positions)
+    games = np.arange(count)[:, None]
+    partner[games, positions[:, 0::2]] = positions[:, 1::2]
+    partner[games, positions[:, 1::2]] = positions[:, 0::2]
+
+    return partner
+
+
+def _record_turn(active, match, matched_pairs, turns, scores, player, num_players):
+    matched_pairs[active] += match
+    turns[active] += 1
+    scores[active, player[active]] += match
+
+    if num_players > 1:
+        player[active] = np.where(match, player[active], 1 - player[active])
+
+
+def _random_turns(partner, rng, num_players):
+    count, cards = partner.shape
+    pairs = cards // 2
+    matched = np.zeros((count, cards), dtype=bool)
+    matched_pairs = np.zeros(count, dtype=np.int64)
+    turns = np.zeros(count, dtype=np.int64)
+    scores = np.zeros((count, 2), dtype=np.int64)
+    player = np.zeros(count, dtype=np.int64)
+
+    active = np.flatnonzero(matched_pairs < pairs)
+    while active.size:
+        # Two distinct unmatched cards: the two smallest random keys, with matched cards pushed out of reach
+        keys = rng.random((active.size, cards))
+        keys[matched[active]] = 2.0
+        picks = np.argpartition(keys, 1, axis=1)[:, :2]
+        first, second = picks[:, 0], picks[:, 1]
+        match = partner[active, first] == second
+
+        matched[active[match], first[match]] = True
+        matched[active[match], second[match]] = True
+        _record_turn(active, match, matched_pairs, turns, scores, player, num_players)
+        active = active[matched_pairs[active] < pairs]
+
+    return turns, scores
+
+
+def _perfect_turns(partner, rng, num_players):
+    # Boards are random, so a perfect player turning over unseen cards in position order plays the same
+    # distribution of games as one picking them at random. Seen cards are then always positions < next_unseen.
+    count, cards = partner.shape
+    pairs = cards // 2
+    next_unseen = np.zeros(count, dtype=np.int64)
+    known_pairs = np.zeros(count, dtype=np.int64)
+    matched_pairs = np.zeros(count, dtype=np.int64)
+    turns = np.zeros(count, dtype=np.int64)
+    scores = np.zeros((count, 2), dtype=np.int64)
+    player = np.zeros(count, dtype=np.int64)
+
+    active = np.arange(count)
+    while active.size:
+        clear_known = known_pairs[active] > 0
+        explore = ~clear_known
+
+        first = np.minimum(next_unseen[active], cards - 1)
+        partner_seen = partner[active, first] < first
+        second = np.minimum(first + 1, cards - 1)
+        second_partner = partner[active, second]
+        lucky = second_partner == first
+        second_pair_known = ~lucky & (second_partner < second)
+
+        # A known pair is cleared, a first card whose partner was seen is completed, or two unseen cards are tried
+        match = clear_known | (explore & (partner_seen | lucky))
+        known_pairs[active] += np.where(clear_known, -1, explore & ~partner_seen & second_pair_known)
+        next_unseen[active] += np.where(clear_known, 0, np.where(partner_seen, 1, 2))
+
+        _record_turn(active, match, matched_pairs, turns, scores, player, num_players)
+        active = active[matched_pairs[active] < pairs]
+
+    return turns, scores
+
+
+def _summary(turns, wins, num_players):
+    games = len(turns)
+    summary = {'games': games, 'mean_turns': 0.0, 'stdev_turns': 0.0, 'min_turns': 0, 'max_turns': 0}
+
+    if games and np is not None and isinstance(turns, np.ndarray):
+        summary.update(mean_turns=float(turns.mean()), stdev_turns=float(turns.std()),
+                       min_turns=int(turns.min()), max_turns=int(turns.max()))
+    elif games:
+        summary.update(mean_turns=statistics.fmean(turns), stdev_turns=statistics.pstdev(turns),
+                       min_turns=min(turns), max_turns=max(turns))
+
+    if num_players > 1:
+        summary['ties'] = int(wins[0])
+        summary['wins'] = {player: int(wins[player]) for player in range(1, num_players + 1)}
+
+    return summary
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Play batches of seeded memory games without a UI')
+    parser.add_argument('--cols', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='perfect')
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--players', type=int, choices=(1, 2), default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--numpy', action='store_true', help='use the vectorized NumPy simulator')
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_arguments(sys.argv[1:] if argv is None else argv)
+    run = simulate_numpy if options.numpy else simulate
+
+    started = time.perf_counter()
+    summary = run(options.cols, options.rows, options.strategy, options.games, options.seed, options.players)
+    elapsed = time.perf_counter() - started
+
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    print(f"elapsed: {elapsed:.2f}s ({options.games / elapsed * 60:,.0f} games/minute)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import queue
+import sqlite3
+import threading
+import time
+
+STATS_PATH = "memorygame_stats.db"
+
+MODE_SINGLE = 'single'
+MODE_VERSUS = 'versus'
+MODE_TIME_ATTACK = 'time_attack'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    difficulty TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    voice INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    elapsed_ms INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    score_1 INTEGER NOT NULL,
+    score_2 INTEGER NOT NULL,
+    rounds INTEGER NOT NULL,
+    seed INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_best_time ON results (difficulty, mode, completed, elapsed_ms);
+CREATE INDEX IF NOT EXISTS results_most_rounds ON results (difficulty, mode, rounds DESC, elapsed_ms);
+"""
+
+INSERT = """
+INSERT INTO results (finished_at, difficulty, mode, voice, completed, elapsed_ms, turns, score_1, score_2, rounds, seed)
+VALUES (:finished_at, :difficulty, :mode, :voice, :completed, :elapsed_ms, :turns, :score_1, :score_2, :rounds, :seed)
+"""
+
+# Best entries of a leaderboard: the fastest cleared boards, or the most Time Attack rounds
+BEST_TIMES = """
+SELECT elapsed_ms, turns, rounds, finished_at FROM results
+WHERE difficulty = ? AND mode = ? AND completed = 1 ORDER BY elapsed_ms LIMIT ?
+"""
+MOST_ROUNDS = """
+SELECT elapsed_ms, turns, rounds, finished_at FROM results
+WHERE difficulty = ? AND mode = ? ORDER BY rounds DESC, elapsed_ms LIMIT ?
+"""
+
+
+def leaderboard_key(mode):
+    """
+    Returns the sort key of a leaderboard entry (elapsed_ms, turns, rounds, finished_at) for mode.
+    """
+    if mode == MODE_TIME_ATTACK:
+        return lambda entry: (-entry[2], entry[0])
+
+    return lambda entry: (entry[0], entry[1])
+
+
+class StatsStore:
+    """
+    Keeps every finished game in an SQLite database in WAL mode. The database is only touched by a
+    background thread: it warms an in-memory cache of the top results per difficulty and mode, then writes
+    the queued results in batches, one transaction each. The game loop only ever queues results and reads
+    the cache, which it updates itself, so a frame never waits on the disk.
+    """
+
+    def __init__(self, path=STATS_PATH, top_n=5, linger=0.25):
+        self.path = path
+        self.top_n = top_n
+        self.linger = linger
+        self.error = None
+        self.written = 0
+        self.batches = 0
+        self._cache = {}  # (difficulty, mode) -> best entries, best first
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='stats-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def record(self, difficulty, mode, completed, elapsed_ms, turns, scores, rounds=0, voice=False, seed=None):
+        """
+        Queues a finished game for writing and adds it to the cached leaderboard straight away.
+        """
+        result = {'finished_at': time.time(), 'difficulty': difficulty, 'mode': mode, 'voice': int(voice),
+                  'completed': int(completed), 'elapsed_ms': elapsed_ms, 'turns': turns,
+                  'score_1': scores.get(1, 0), 'score_2': scores.get(2, 0), 'rounds': rounds, 'seed': seed}
+        self._pending.put(result)
+
+        if completed or mode == MODE_TIME_ATTACK:
+            self._add_to_cache(difficulty, mode, [(elapsed_ms, turns, rounds, result['finished_at'])])
+
+    def top(self, difficulty, mode):
+        """
+        Returns the cached best entries (elapsed_ms, turns, rounds, finished_at) for difficulty and mode.
+        """
+        with self._lock:
+            return list(self._cache.get((difficulty, mode), ()))
+
+    def close(self, timeout=2.0):
+        """
+        Writes whatever is still queued and stops the background thread.
+        """
+        self._pending.put(None)
+        self._thread.join(timeout)
+
+    def _add_to_cache(self, difficulty, mode, entries):
+        with self._lock:
+            key = (difficulty, mode)
+            self._cache[key] = sorted(self._cache.get(key, []) + entries, key=leaderboard_key(mode))[:self.top_n]
+
+    def _run(self):
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Safe in WAL mode; commits skip the fsync
+            connection.executescript(SCHEMA)
+            self._warm(connection)
+        except sqlite3.Error as error:
+            self.error = str(error)
+            print(f"Stats unavailable: {error}")
+            return
+
+        while True:
+            # Results queued within linger seconds of each other go into one transaction
+            batch = [self._pending.get()]
+            flush_at = time.monotonic() + self.linger
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._pending.get(timeout=max(0.0, flush_at - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            results = [result for result in batch if result is not None]
+            if results:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, results)
+                    self.written += len(results)
+                    self.batches += 1
+                except sqlite3.Error as error:
+                    self.error = str(error)
+                    print(f"Could not save {len(results)} result(s): {error}")
+
+            if batch[-1] is None:  # Queued by close()
+                break
+
+        connection.close()
+
+    def _warm(self, connection):
+        """
+        Loads the top entries of every difficulty and mode that has results into the cache.
+        """
+        for difficulty, mode in connection.execute("SELECT DISTINCT difficulty, mode FROM results").fetchall():
+            query = MOST_ROUNDS if mode == MODE_TIME_ATTACK else BEST_TIMES
+            entries = connection.execute(query, (difficulty, mode, self.top_n)).fetchall()
+            self._add_to_cache(difficulty, mode, [tuple(entry) for entry in entries])
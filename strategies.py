@@ -0,0 +1,137 @@
+import functools
+
+
+class RandomStrategy:
+    """
+    Turns over unmatched cards uniformly at random and remembers nothing.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def reset(self, game):
+        pass
+
+    def pick(self, game):
+        choices = [index for index in game.unmatched() if index not in game.selected]
+        return self.rng.choice(choices)
+
+    def observe(self, game, index):
+        pass
+
+
+class PerfectMemoryStrategy:
+    """
+    Remembers every card it has seen: clears known pairs first, otherwise turns over an unseen card and
+    completes the pair if its partner has already been seen.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.unseen = []
+        self.seen = bytearray()
+        self.seen_faces = {}  # face id -> seen card whose partner has not been seen yet
+        self.known_pairs = []
+
+    def reset(self, game):
+        self.unseen = list(range(len(game)))
+        self.rng.shuffle(self.unseen)
+        self.seen = bytearray(len(game))
+        self.seen_faces = {}
+        self.known_pairs = []
+
+    def pick(self, game):
+        if not game.selected:
+            while self.known_pairs:
+                first, second = self.known_pairs[-1]
+                if not game.matched[first]:
+                    return first
+                self.known_pairs.pop()
+
+            return self._draw_unseen(game)
+
+        first = game.selected[0]
+
+        if self.known_pairs and first in self.known_pairs[-1]:
+            pair = self.known_pairs.pop()
+            return pair[1] if pair[0] == first else pair[0]
+
+        return self._draw_unseen(game)
+
+    def observe(self, game, index):
+        self.seen[index] = 1
+        face = game.board[index]
+        other = self.seen_faces.get(face)
+
+        if other is None:
+            self.seen_faces[face] = index
+        elif other != index:
+            del self.seen_faces[face]
+            self.known_pairs.append((other, index))
+
+    def _draw_unseen(self, game):
+        while self.unseen:
+            index = self.unseen.pop()
+            if not self.seen[index] and game.can_select(index):
+                return index
+
+        # Everything has been seen; fall back to any card that can still be turned over
+        return next(index for index in game.unmatched() if game.can_select(index))
+
+
+class BoundedMemoryStrategy:
+    """
+    Remembers the faces of at most capacity cards (None for no limit), forgetting the one seen longest ago
+    first, and takes in each card it sees only with probability recall. Plays a remembered pair if it knows
+    one; otherwise turns over a card it does not remember and completes the pair from memory if it can.
+    """
+
+    def __init__(self, rng, capacity=None, recall=1.0):
+        self.rng = rng
+        self.capacity = capacity
+        self.recall = recall
+        self.memory = {}  # card index -> face id, least recently seen first
+
+    def reset(self, game):
+        self.memory = {}
+
+    def pick(self, game):
+        memory = self.memory
+        for index in [index for index in memory if game.matched[index]]:
+            del memory[index]
+
+        if not game.selected:
+            faces = {}
+            for index, face in memory.items():
+                if face in faces:
+                    return faces[face]
+                faces[face] = index
+
+            return self._pick_unknown(game)
+
+        first = game.selected[0]
+        face = game.board[first]  # The first card is face up
+        partner = next((index for index, known in memory.items() if known == face and index != first), None)
+
+        return partner if partner is not None else self._pick_unknown(game)
+
+    def observe(self, game, index):
+        self.memory.pop(index, None)
+
+        if self.recall >= 1.0 or self.rng.random() < self.recall:
+            self.memory[index] = game.board[index]
+            if self.capacity is not None and len(self.memory) > self.capacity:
+                del self.memory[next(iter(self.memory))]
+
+    def _pick_unknown(self, game):
+        choices = [index for index in game.unmatched() if index not in self.memory and game.can_select(index)]
+
+        return self.rng.choice(choices or [index for index in game.unmatched() if game.can_select(index)])
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'forgetful': functools.partial(BoundedMemoryStrategy, recall=0.5),
+    'bounded': functools.partial(BoundedMemoryStrategy, capacity=6),
+    'perfect': PerfectMemoryStrategy,
+}
@@ -0,0 +1,29 @@
+import itertools
+
+import pytest
+
+from card_faces import MAX_GENERATED_FACES, MIN_COLOR_DISTANCE, PALETTE, color_distance, generate_faces
+
+
+def test_palette_colors_look_different():
+    for first, second in itertools.combinations(PALETTE + [(0, 0, 0), (255, 255, 255)], 2):
+        assert color_distance(first, second) >= MIN_COLOR_DISTANCE
+
+
+def test_generated_faces_are_distinct():
+    faces = generate_faces(MAX_GENERATED_FACES)
+    assert len(set(faces)) == MAX_GENERATED_FACES
+
+
+def test_faces_of_a_huge_board_differ_in_color_or_glyph():
+    # Faces sharing a color must differ in their glyph
+    faces = generate_faces(500)
+    glyphs = {}
+    for face in faces:
+        assert (face.outer, face.inner) not in glyphs.setdefault(face.color, set())
+        glyphs[face.color].add((face.outer, face.inner))
+
+
+def test_generate_faces_refuses_more_than_can_be_told_apart():
+    with pytest.raises(ValueError):
+        generate_faces(MAX_GENERATED_FACES + 1)
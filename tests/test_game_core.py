@@ -0,0 +1,92 @@
+import pytest
+
+from game_core import MemoryGame
+
+
+def pair_positions(game):
+    positions = {}
+    for index in range(len(game)):
+        positions.setdefault(game.board[index], []).append(index)
+
+    return list(positions.values())
+
+
+def test_board_holds_every_face_twice():
+    game = MemoryGame(4, 4, faces='abcdefgh', seed=1)
+
+    assert len(game) == 16
+    assert sorted(game.face(index) for index in range(len(game))) == sorted('abcdefgh' * 2)
+    assert game.unmatched() == list(range(16))
+
+
+def test_too_few_faces_for_the_board():
+    with pytest.raises(ValueError):
+        MemoryGame(4, 4, faces='abc')
+
+
+def test_match_scores_and_keeps_the_turn():
+    game = MemoryGame(4, 4, num_players=2, seed=1)
+    first, second = pair_positions(game)[0]
+
+    assert game.select(first) and game.select(second)
+    assert game.pair_selected
+    assert game.resolve() is True
+    assert game.is_matched(first) and game.is_matched(second)
+    assert game.scores == {1: 1, 2: 0}
+    assert (game.current_player, game.turns, game.matched_count, game.selected) == (1, 1, 2, [])
+    assert not game.select(first)  # Matched cards stay off the board
+
+
+def test_miss_passes_the_turn():
+    game = MemoryGame(4, 4, num_players=2, seed=1)
+    pairs = pair_positions(game)
+
+    game.select(pairs[0][0])
+    game.select(pairs[1][0])
+    assert game.resolve() is False
+    assert game.scores == {1: 0, 2: 0}
+    assert (game.current_player, game.turns, game.matched_count) == (2, 1, 0)
+    assert not game.is_matched(pairs[0][0])
+
+
+def test_select_refuses_invalid_picks():
+    game = MemoryGame(2, 2, seed=1)
+
+    assert not game.select(-1) and not game.select(4)
+    assert game.select(0)
+    assert not game.select(0)  # Already turned over
+    assert game.select(1)
+    assert not game.select(2)  # A pair is already showing
+    assert game.resolve() is not None
+    assert game.resolve() is None  # Nothing left to check
+
+
+def test_clearing_the_board_completes_the_game():
+    game = MemoryGame(4, 4, seed=3)
+
+    for first, second in pair_positions(game):
+        game.select(first)
+        game.select(second)
+        game.resolve()
+
+    assert game.is_complete
+    assert game.unmatched() == []
+    assert game.scores == {1: 8}
+
+
+def test_reset_clears_the_game_and_reproduces_a_seeded_board():
+    game = MemoryGame(4, 4, num_players=2, seed=1)
+    first, second = pair_positions(game)[0]
+    game.select(first)
+    game.select(second)
+    game.resolve()
+
+    game.reset(42)
+    board = list(game.board)
+    assert (game.matched_count, game.turns, game.selected, game.current_player) == (0, 0, [], 1)
+    assert game.scores == {1: 0, 2: 0}
+    assert not any(game.matched)
+
+    game.reset(42)
+    assert list(game.board) == board
+    assert list(MemoryGame(4, 4, seed=1).board) != list(MemoryGame(4, 4, seed=2).board)
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from net_protocol import (BOARD, DELTA, DELTA_HEADER, HIDE, LENGTH, MATCH, PICK, PICK_BODY, REVEAL, SCORE, SEATS, TURN,
+                          WELCOME_HEADER, decode_events, encode_events, encode_message, read_message)
+
+EVENTS = [
+    (SEATS, 2),
+    (BOARD, 40, 25),
+    (TURN, 1),
+    (REVEAL, 999, 499, 1),
+    (REVEAL, 0, 0, 2),
+    (MATCH, 999, 0, 499),
+    (HIDE, 3, 65535),
+    (SCORE, 2, 17),
+]
+
+
+@pytest.mark.parametrize('event', EVENTS)
+def test_every_event_round_trips(event):
+    assert decode_events(encode_events([event])) == [event]
+
+
+def test_delta_round_trip():
+    body = DELTA_HEADER.pack(12) + encode_events(EVENTS)
+
+    assert DELTA_HEADER.unpack_from(body) == (12,)
+    assert decode_events(body, DELTA_HEADER.size) == EVENTS
+
+
+def test_welcome_carries_the_board_as_events():
+    body = WELCOME_HEADER.pack(2, 2, 4, 4) + encode_events(EVENTS[:3])
+
+    assert WELCOME_HEADER.unpack_from(body) == (2, 2, 4, 4)
+    assert decode_events(body, WELCOME_HEADER.size) == EVENTS[:3]
+
+
+def test_empty_delta_has_no_events():
+    assert decode_events(DELTA_HEADER.pack(0), DELTA_HEADER.size) == []
+
+
+def test_encode_message_frames_the_payload():
+    message = encode_message(PICK, PICK_BODY.pack(7))
+
+    assert LENGTH.unpack_from(message) == (1 + PICK_BODY.size,)
+    assert message[LENGTH.size] == PICK
+    assert PICK_BODY.unpack_from(message, LENGTH.size + 1) == (7,)
+
+
+def read_all(data, max_length=None):
+    """
+    Feeds data to a stream reader and returns what read_message reads from it until the stream ends.
+    """
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        messages = []
+        while True:
+            message = await (read_message(reader) if max_length is None else read_message(reader, max_length))
+            messages.append(message)
+            if message is None:
+                return messages
+
+    return asyncio.run(read())
+
+
+def test_read_message_splits_the_stream_into_messages():
+    body = DELTA_HEADER.pack(1) + encode_events(EVENTS)
+    data = encode_message(DELTA, body) + encode_message(PICK, PICK_BODY.pack(3))
+
+    assert read_all(data) == [(DELTA, body), (PICK, PICK_BODY.pack(3)), None]
+
+
+def test_read_message_stops_at_a_cut_off_message():
+    assert read_all(encode_message(PICK, PICK_BODY.pack(3))[:-1]) == [None]
+
+
+def test_read_message_refuses_oversized_and_empty_messages():
+    assert read_all(encode_message(PICK, bytes(100)), max_length=50) == [None]
+    assert read_all(LENGTH.pack(0)) == [None]
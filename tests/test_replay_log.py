@@ -0,0 +1,87 @@
+import pytest
+
+from game_core import MemoryGame
+from replay import replay, scan
+from replay_log import (GAME_OVER, MATCH, MISS, MOUSE, REJECTED, RESET, RESOLVE, SELECT, SELECTED, SYSTEM,
+                        TIME_ATTACK, ReplayLog, ReplayWriter, np)
+
+
+def record_session(path, cols=4, rows=4, seed=7):
+    """
+    Plays one board to the end, recording every move like the game does: one miss, then every pair in turn,
+    with a second pick of an already turned card rejected each turn. Returns the finished game and the number
+    of records written.
+    """
+    ticks = iter(range(0, 100000, 10))
+    writer = ReplayWriter(path, cols, rows, 2, TIME_ATTACK, seed, lambda: next(ticks))
+    game = MemoryGame(cols, rows, num_players=2)
+    game.reset(seed)
+    writer.record(RESET, SYSTEM, value=seed)
+
+    pairs = {}
+    for index in range(len(game)):
+        pairs.setdefault(game.board[index], []).append(index)
+    turns = [(pairs[0][0], pairs[1][0])] + list(pairs.values())
+
+    for first, second in turns:
+        for index in (first, first, second):
+            writer.record(SELECT, MOUSE, SELECTED if game.select(index) else REJECTED, index)
+        match = game.resolve()
+        writer.record(RESOLVE, outcome=MATCH if match else MISS, value=game.turns)
+    writer.record(GAME_OVER, value=game.turns)
+    writer.close()
+
+    return game, writer.records
+
+
+def test_replay_log_round_trip(tmp_path):
+    path = tmp_path / 'session.mgr'
+    game, written = record_session(path)
+
+    with ReplayLog(path) as log:
+        assert (log.cols, log.rows, log.players, log.flags, log.seed) == (4, 4, 2, TIME_ATTACK, 7)
+        records = list(log.records())
+        assert len(log) == len(records) == written
+        assert records[0] == (10, RESET, SYSTEM, 0, 7)  # Ticks count from when the writer was opened
+        assert [record.tick for record in records] == sorted(record.tick for record in records)
+        assert records[-1].kind == GAME_OVER and records[-1].value == game.turns
+
+        replayed, divergences = replay(log)
+        assert divergences == []
+        assert replayed.is_complete
+        assert (replayed.turns, replayed.scores) == (game.turns, game.scores)
+
+        summary = scan(log)
+        assert summary['records'] == written
+        assert summary['boards'] == 1
+        assert summary['matches'] == 8
+        assert summary['rejected'] == game.turns  # The repeated pick of every turn
+
+
+@pytest.mark.skipif(np is None, reason="needs NumPy")
+def test_replay_log_array_matches_records(tmp_path):
+    path = tmp_path / 'session.mgr'
+    record_session(path)
+
+    with ReplayLog(path) as log:
+        array = log.array()
+        assert [tuple(int(array[name][number]) for name in ('tick', 'kind', 'source', 'outcome', 'value'))
+                for number in range(len(array))] == [tuple(record) for record in log.records()]
+
+
+def test_replay_log_ignores_a_partial_last_record(tmp_path):
+    path = tmp_path / 'session.mgr'
+    _, written = record_session(path)
+    with open(path, 'ab') as log_file:
+        log_file.write(b'\x01\x02\x03')  # Cut short by a crash mid-write
+
+    with ReplayLog(path) as log:
+        assert len(log) == len(list(log.records())) == written
+
+
+def test_replay_log_rejects_other_files(tmp_path):
+    path = tmp_path / 'notes.txt'
+    path.write_bytes(b'not a replay log at all')
+
+    with pytest.raises(ValueError):
+        ReplayLog(path)
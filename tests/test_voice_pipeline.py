@@ -0,0 +1,122 @@
+import random
+from array import array
+
+import pytest
+
+from voice_pipeline import (VOICE_BLOCK_FRAMES, SpeechGate, is_unambiguous, is_unambiguous_board_command,
+                            number_to_words, parse_board_command, parse_card_number, words_to_number)
+
+
+@pytest.mark.parametrize('text, number', [
+    ("seven", 7),
+    ("pick seven", 7),
+    ("card twelve", 12),
+    ("twenty one", 21),
+    ("7", 7),
+    ("hundred", 100),
+    ("two hundred five", 205),
+    ("one hundred fifteen", 115),
+    ("one hundred twenty three", 123),
+    ("one thousand five", 1005),
+    ("two thousand three hundred forty", 2340),
+    ("two hundred thousand three hundred", 200300),
+])
+def test_parse_card_number(text, number):
+    assert parse_card_number(text) == number
+
+
+@pytest.mark.parametrize('text', [
+    "seven seven",  # Two numbers in one utterance, not fourteen
+    "one two",
+    "seven twenty",
+    "twelve three",
+    "twenty thirty",
+    "twenty twelve",
+    "twenty hundred",
+    "one hundred hundred",
+    "one thousand two thousand",
+    "seven banana",
+    "pick",
+    "",
+])
+def test_parse_card_number_rejects_run_together_numbers(text):
+    assert parse_card_number(text) is None
+
+
+def test_every_spelled_number_parses_back():
+    for number in range(1, 20001):
+        assert words_to_number(number_to_words(number).split()) == number
+
+
+@pytest.mark.parametrize('text', ["seven seven", "one two", "seven twenty"])
+def test_run_together_numbers_are_not_committed_early(text):
+    assert not is_unambiguous(text, max_number=20)
+
+
+def test_is_unambiguous():
+    assert is_unambiguous("seven", max_number=12)
+    assert not is_unambiguous("six", max_number=20)  # May still become "sixteen"
+    assert not is_unambiguous("twenty", max_number=30)  # May still become "twenty one"
+    assert not is_unambiguous("thirteen", max_number=12)
+
+
+@pytest.mark.parametrize('text, target', [
+    ("board two seven", (2, 7)),
+    ("board two card seven", (2, 7)),
+    ("pick board three twelve", (3, 12)),
+    ("board 2 7", (2, 7)),
+    ("board twenty one five", (21, 5)),
+    ("board two", None),
+    ("seven", None),
+    ("board two seven seven", None),
+    ("board thirty one", None),
+])
+def test_parse_board_command(text, target):
+    assert parse_board_command(text, boards=24) == target
+
+
+def test_is_unambiguous_board_command():
+    assert is_unambiguous_board_command("board two seven", max_number=16, boards=4)
+    assert not is_unambiguous_board_command("board twenty one five", max_number=16, boards=4)
+    assert not is_unambiguous_board_command("board twenty five", max_number=16, boards=24)
+    assert not is_unambiguous_board_command("board two seven seven", max_number=20, boards=4)
+
+
+def noise_block(rng, rms):
+    # Uniform noise in [-a, a] has an RMS of a / sqrt(3)
+    amplitude = rms * 3 ** 0.5
+    return array('h', (round(rng.uniform(-amplitude, amplitude)) for _ in range(VOICE_BLOCK_FRAMES))).tobytes()
+
+
+def test_speech_gate_follows_a_step_in_background_noise():
+    rng = random.Random(1)
+    gate = SpeechGate()
+    for _ in range(200):
+        gate.process(noise_block(rng, 50))
+    assert gate.noise_floor < 100
+
+    fan = [noise_block(rng, 400) for _ in range(16)]
+    passed = sum(len(gate.process(fan[block % len(fan)])[0]) for block in range(2000))
+
+    assert not gate.open
+    assert passed < 100
+    assert gate.noise_floor > 300
+
+    # Speech over the louder background still opens the gate
+    assert gate.process(noise_block(rng, 4000))[0]
+
+
+def test_speech_gate_stays_open_through_speech():
+    rng = random.Random(2)
+    gate = SpeechGate()
+    for _ in range(50):
+        gate.process(noise_block(rng, 50))
+
+    # Three seconds of words with short pauses between them
+    passed = 0
+    for block in range(48):
+        blocks, ended = gate.process(noise_block(rng, 3000 if block % 8 < 6 else 60))
+        passed += len(blocks)
+        assert not ended
+    assert gate.open
+    assert passed >= 48
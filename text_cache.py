@@ -0,0 +1,106 @@
+from collections import OrderedDict
+
+import pygame
+
+DIGIT_GLYPHS = "0123456789:"
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces keyed by (font, text, color, background).
+    Card numbers, menu labels and HUD lines are rasterized once and then reused every frame.
+    """
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, background=None):
+        """
+        Returns the rendered surface for text, rasterizing it only on a cache miss.
+        """
+        key = (font, text, color, background)
+        surface = self._surfaces.get(key)
+
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+
+        if background is None:
+            surface = font.render(text, True, color)
+        else:
+            surface = font.render(text, True, color, background)
+
+        self._store(key, surface)
+
+        return surface
+
+    def render_digits(self, font, text, color, background=None):
+        """
+        Returns a surface for a string made only of digits and ':' (e.g. the timer), composed from
+        pre-rendered digit glyphs instead of rasterizing the whole string.
+        """
+        key = (font, text, color, background, 'digits')
+        surface = self._surfaces.get(key)
+
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        glyphs = [self.render(font, char, color, background) for char in text]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max((glyph.get_height() for glyph in glyphs), default=font.get_height())
+
+        if background is None:
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface((width, height))
+            surface.fill(background)
+
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+
+        self._store(key, surface)
+
+        return surface
+
+    def preload_digits(self, font, color, background=None):
+        """
+        Pre-renders the digit glyphs so the first timer update does not rasterize anything.
+        """
+        for char in DIGIT_GLYPHS:
+            self.render(font, char, color, background)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        """
+        Returns the hit/miss counters and current size of the cache.
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._surfaces),
+        }
+
+    def _store(self, key, surface):
+        self._surfaces[key] = surface
+
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)  # Evict the least recently used surface
+
+
+# Shared cache used by every screen of the game
+text_cache = TextCache()
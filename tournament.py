@@ -0,0 +1,160 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_core import MemoryGame
+from simulator import play_game
+from strategies import STRATEGIES
+
+
+def play_chunk(cols, rows, first, second, games, seed):
+    """
+    Plays games two-player games of strategy first against strategy second, swapping who starts every game.
+    Runs in a worker process. Returns (wins of first, wins of second, ties, total turns).
+    """
+    rng = random.Random(seed)
+    game = MemoryGame(cols, rows, num_players=2, seed=rng.getrandbits(64))
+    players = (STRATEGIES[first](random.Random(rng.getrandbits(64))),
+               STRATEGIES[second](random.Random(rng.getrandbits(64))))
+    wins = [0, 0]
+    ties = 0
+    turns = 0
+
+    for number in range(games):
+        swapped = number % 2
+        game.reset()
+        turns += play_game(game, players[::-1] if swapped else players)
+
+        if game.scores[1] == game.scores[2]:
+            ties += 1
+        else:
+            winner = 0 if game.scores[1] > game.scores[2] else 1
+            wins[winner ^ swapped] += 1
+
+    return wins[0], wins[1], ties, turns
+
+
+def play_solo_chunk(cols, rows, strategy, games, seed):
+    """
+    Plays games one-player games of strategy. Returns (games, total turns).
+    """
+    rng = random.Random(seed)
+    game = MemoryGame(cols, rows, seed=rng.getrandbits(64))
+    players = [STRATEGIES[strategy](random.Random(rng.getrandbits(64)))]
+    turns = 0
+
+    for _ in range(games):
+        game.reset()
+        turns += play_game(game, players)
+
+    return games, turns
+
+
+def elo_ratings(results, names, iterations=200):
+    """
+    Fits Elo ratings (random at 1000) to the pairwise results {(a, b): (wins a, wins b, ties)}, counting a tie
+    as half a win, by repeatedly moving each rating towards the score it actually got.
+    """
+    ratings = dict.fromkeys(names, 1000.0)
+
+    for _ in range(iterations):
+        for name in names:
+            actual = expected = 0.0
+            for (a, b), (wins_a, wins_b, ties) in results.items():
+                if name not in (a, b) or a == b:
+                    continue
+                games = wins_a + wins_b + ties
+                other = b if name == a else a
+                actual += (wins_a if name == a else wins_b) + ties / 2
+                expected += games / (1 + 10 ** ((ratings[other] - ratings[name]) / 400))
+            if expected:
+                # Clamp so a strategy that never loses does not run off to infinity
+                score = min(max(actual / expected, 0.01), 100)
+                ratings[name] += 400 * math.log10(score) / 2
+
+        anchor = ratings.get('random', 1000.0) - 1000.0
+        ratings = {name: rating - anchor for name, rating in ratings.items()}
+
+    return ratings
+
+
+def chunks(games, chunk_size):
+    while games > 0:
+        yield min(chunk_size, games)
+        games -= chunk_size
+
+
+def run_tournament(cols, rows, names, games, seed=None, workers=None, chunk_size=5000):
+    """
+    Plays games games for every pairing of names (and games solo games of each) across a process pool.
+    Returns (pairwise results, solo mean turns).
+    """
+    rng = random.Random(seed)
+    pairings = list(itertools.combinations(names, 2))
+    results = {pairing: (0, 0, 0) for pairing in pairings}
+    solo = {name: (0, 0) for name in names}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        duels = {pool.submit(play_chunk, cols, rows, a, b, count, rng.getrandbits(64)): (a, b)
+                 for a, b in pairings for count in chunks(games, chunk_size)}
+        solos = {pool.submit(play_solo_chunk, cols, rows, name, count, rng.getrandbits(64)): name
+                 for name in names for count in chunks(games, chunk_size)}
+
+        for future, pairing in duels.items():
+            wins_a, wins_b, ties, _ = future.result()
+            total = results[pairing]
+            results[pairing] = (total[0] + wins_a, total[1] + wins_b, total[2] + ties)
+
+        for future, name in solos.items():
+            played, turns = future.result()
+            solo[name] = (solo[name][0] + played, solo[name][1] + turns)
+
+    return results, {name: turns / played for name, (played, turns) in solo.items() if played}
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description='Rate the AI strategies against each other on a process pool')
+    parser.add_argument('--cols', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help=f"comma-separated strategies (default {','.join(STRATEGIES)})")
+    parser.add_argument('--games', type=int, default=100000, help='games per pairing and solo games per strategy')
+    parser.add_argument('--workers', type=int, default=None, help=f'worker processes (default {os.cpu_count()})')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='games per task sent to a worker')
+    parser.add_argument('--seed', type=int, default=None)
+
+    options = parser.parse_args(argv)
+    options.strategies = options.strategies.split(',')
+    unknown = [name for name in options.strategies if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+
+    return options
+
+
+def main(argv=None):
+    options = parse_arguments(sys.argv[1:] if argv is None else argv)
+
+    started = time.perf_counter()
+    results, solo = run_tournament(options.cols, options.rows, options.strategies, options.games, options.seed,
+                                   options.workers, options.chunk_size)
+    elapsed = time.perf_counter() - started
+    total_games = options.games * (len(results) + len(solo))
+
+    for (a, b), (wins_a, wins_b, ties) in results.items():
+        games = wins_a + wins_b + ties
+        print(f"{a} vs {b}: {wins_a / games:.1%} / {wins_b / games:.1%}, ties {ties / games:.1%}")
+
+    ratings = elo_ratings(results, options.strategies)
+    for name in sorted(options.strategies, key=lambda name: -ratings[name]):
+        print(f"{name:<10} Elo {ratings[name]:6.0f}, {solo[name]:.1f} turns per solo game")
+    print(f"elapsed: {elapsed:.2f}s ({total_games / elapsed * 60:,.0f} games/minute)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import queue
+import time
+
+from voice_engine import voice_engine
+from voice_pipeline import VOICE_BLOCK_FRAMES, VoicePipeline, voice_grammar
+
+
+def capture_voice(max_number, on_command, boards=0, on_ready=None):
+    """
+    Listens to the microphone and calls on_command(command, speech_end) for every command the grammar
+    recognizer hears, until the process exits. on_ready(pipeline), if given, gets the VoicePipeline once the
+    recognizer is ready, for its counters. Returns early if the voice model cannot be loaded.
+    Shared by the voice threads of the game and the kiosk.
+    """
+    # Imported here so players who never use voice control don't pay for the native library
+    import pyaudio
+
+    grammar = voice_grammar(max_number, boards)
+    recognizer = voice_engine.acquire_recognizer(grammar)  # Waits for the shared model if it is still loading
+    if recognizer is None:
+        print(voice_engine.error)
+        return
+
+    pipeline = VoicePipeline(recognizer, max_number=max_number, boards=boards)  # Gates off silent audio
+    if on_ready is not None:
+        on_ready(pipeline)
+    audio_blocks = queue.Queue()
+
+    def on_audio(data, frame_count, time_info, status):
+        audio_blocks.put((data, time.perf_counter()))
+        return None, pyaudio.paContinue
+
+    # Callback mode with small buffers: audio arrives every 64 ms instead of in blocking 256 ms reads
+    p = pyaudio.PyAudio()
+    stream = p.open(format=pyaudio.paInt16, channels=1, rate=voice_engine.sample_rate, input=True,
+                    frames_per_buffer=VOICE_BLOCK_FRAMES, stream_callback=on_audio)
+    stream.start_stream()
+
+    try:
+        while True:
+            data, captured = audio_blocks.get()
+
+            for command, speech_end in pipeline.process(data, captured):
+                on_command(command, speech_end)
+    finally:
+        stream.close()
+        p.terminate()
+        voice_engine.release_recognizer(recognizer, grammar)
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+MODEL_PATH = "vosk-model-small-en-us-0.15"
+SAMPLE_RATE = 16000
+
+IDLE = 'idle'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class VoiceEngine:
+    """
+    Owns the single shared Vosk model. The model can be loaded in the background while the menus are shown,
+    and recognizers built on it are handed out from a pool so a new voice session never reloads the model.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, sample_rate=SAMPLE_RATE):
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.state = IDLE
+        self.error = None
+        self.load_time = None  # Seconds the model took to load
+        self._model = None
+        self._recognizer_class = None
+        self._pools = {}  # grammar (None for open vocabulary) -> idle recognizers
+        self._lock = threading.Lock()
+        self._ready = threading.Event()  # Set once loading has finished, successfully or not
+
+    def preload(self):
+        """
+        Starts loading the model on a background thread; does nothing if loading already started.
+        """
+        with self._lock:
+            if self.state != IDLE:
+                return
+            self.state = LOADING
+
+        thread = threading.Thread(target=self._load, name='voice-model-loader')
+        thread.daemon = True
+        thread.start()
+
+    def _load(self):
+        started = time.perf_counter()
+
+        try:
+            if not os.path.exists(self.model_path):
+                raise FileNotFoundError(f"Please download the model from https://alphacephei.com/vosk/models and "
+                                        f"unpack it as '{self.model_path}' in the current folder.")
+
+            # Imported here so the native library only loads when voice control may be used
+            from vosk import Model, KaldiRecognizer
+
+            self._model = Model(self.model_path)
+            self._recognizer_class = KaldiRecognizer
+            self.state = READY
+        except Exception as error:  # Missing model, missing vosk or a broken install all leave voice unavailable
+            self.error = str(error)
+            self.state = FAILED
+        finally:
+            self.load_time = time.perf_counter() - started
+            self._ready.set()
+
+    def wait_ready(self, timeout=None):
+        """
+        Starts loading if needed and blocks until it finishes. Returns True if the model is usable.
+        """
+        self.preload()
+        self._ready.wait(timeout)
+
+        return self.state == READY
+
+    def acquire_recognizer(self, grammar=None):
+        """
+        Returns a recognizer from the pool (or a new one), waiting for the model if it is still loading.
+        Returns None if the model could not be loaded.
+        """
+        if not self.wait_ready():
+            return None
+
+        with self._lock:
+            pool = self._pools.get(grammar)
+            if pool:
+                return pool.pop()
+
+        if grammar is None:
+            return self._recognizer_class(self._model, self.sample_rate)
+
+        return self._recognizer_class(self._model, self.sample_rate, grammar)
+
+    def release_recognizer(self, recognizer, grammar=None):
+        """
+        Resets a recognizer and returns it to the pool it was acquired from for the next session.
+        """
+        recognizer.Reset()
+
+        with self._lock:
+            self._pools.setdefault(grammar, []).append(recognizer)
+
+    def status_text(self):
+        """
+        Returns a short line describing the model state for the UI.
+        """
+        if self.state == LOADING:
+            return "Voice: loading model..."
+        if self.state == READY:
+            return f"Voice: ready ({self.load_time:.1f}s load)"
+        if self.state == FAILED:
+            return "Voice: unavailable"
+
+        return "Voice: not loaded"
+
+
+# Shared engine used by every voice session
+voice_engine = VoiceEngine()
@@ -0,0 +1,393 @@
+import functools
+import json
+import operator
+import statistics
+import time
+from array import array
+from collections import deque
+
+NUMBER_WORDS = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+    "thirteen": 13,
+    "fourteen": 14,
+    "fifteen": 15,
+    "sixteen": 16,
+    "seventeen": 17,
+    "eighteen": 18,
+    "nineteen": 19,
+    "twenty": 20,
+    "thirty": 30,
+    "forty": 40,
+    "fifty": 50,
+    "sixty": 60,
+    "seventy": 70,
+    "eighty": 80,
+    "ninety": 90
+}
+SCALE_WORDS = {"hundred": 100, "thousand": 1000}
+CONTROL_WORDS = ["pick", "card", "number", "select", "and"]
+BOARD_WORD = "board"  # Starts a command for one board of a multi-board kiosk: "board two, seven"
+
+VOICE_BLOCK_FRAMES = 1024  # 64 ms of 16 kHz audio per callback instead of 256 ms blocking reads
+
+
+def number_to_words(number):
+    """
+    Spells out a positive number below a million the way the recognizer reports it ("one hundred twenty").
+    """
+    if number < 20 or number < 100 and number % 10 == 0:
+        return _WORDS_BY_VALUE[number]
+    if number < 100:
+        return f"{_WORDS_BY_VALUE[number - number % 10]} {_WORDS_BY_VALUE[number % 10]}"
+    if number < 1000:
+        rest = number % 100
+        return f"{_WORDS_BY_VALUE[number // 100]} hundred" + (f" {number_to_words(rest)}" if rest else "")
+
+    rest = number % 1000
+    return f"{number_to_words(number // 1000)} thousand" + (f" {number_to_words(rest)}" if rest else "")
+
+
+_WORDS_BY_VALUE = {value: word for word, value in NUMBER_WORDS.items()}
+
+
+@functools.lru_cache(maxsize=8)
+def _spellings(max_number):
+    return tuple(tuple(number_to_words(number).split()) for number in range(1, max_number + 1))
+
+
+def voice_grammar(max_number=20, boards=0):
+    """
+    Returns the Vosk grammar limiting recognition to the words needed for card numbers up to max_number
+    and the control words. With boards, it also covers the board word and the board numbers.
+    """
+    words = []
+    for spelling in _spellings(max(max_number, boards)):
+        words.extend(word for word in spelling if word not in words)
+
+    return json.dumps(words + CONTROL_WORDS + ([BOARD_WORD] if boards else []) + ["[unk]"])
+
+
+def _number_words(text):
+    return [word for word in text.strip().lower().split() if word not in CONTROL_WORDS and word != "[unk]"]
+
+
+def words_to_number(words):
+    """
+    Returns the value of spelled-out number words (e.g. ["two", "hundred", "five"]), or None if they are not
+    one well-formed number: "seven seven", "one two" and "seven twenty" are two numbers run together, not a sum.
+    """
+    total = 0
+    current = 0
+    previous = None  # 'unit', 'teen', 'tens' or the scale word before this word
+    scales = set()
+
+    for word in words:
+        if word in NUMBER_WORDS:
+            value = NUMBER_WORDS[word]
+            kind = 'unit' if value < 10 else 'teen' if value < 20 else 'tens'
+            # A unit may follow a tens word ("twenty one"); otherwise a number word only starts a number or
+            # follows a scale word ("two hundred five")
+            if previous not in (None, *SCALE_WORDS) and not (kind == 'unit' and previous == 'tens'):
+                return None
+            current += value
+            previous = kind
+        elif word in SCALE_WORDS:
+            if word in scales or word == "hundred" and previous == 'tens':
+                return None
+            if word == "hundred":
+                current = max(current, 1) * SCALE_WORDS[word]
+                scales.add(word)
+            else:
+                total += max(current, 1) * SCALE_WORDS[word]
+                current = 0
+                scales = {word}  # The hundreds below the thousands may be said again
+            previous = word
+        else:
+            return None
+
+    return total + current or None
+
+
+def parse_card_number(text):
+    """
+    Returns the 1-based card number spoken in text (e.g. "pick seven", "card two hundred five" or "7"), or None.
+    """
+    words = _number_words(text)
+
+    if not words:
+        return None
+
+    if len(words) == 1 and words[0].isdigit():
+        return int(words[0])
+
+    return words_to_number(words)
+
+
+def _split_board(words, boards):
+    """
+    Splits the number words of a board command into (board number, board words, card words). The board is
+    the longest board number the words start with that still leaves words for the card. Returns None if the
+    words do not start with the board word and a board number.
+    """
+    if len(words) < 3 or words[0] != BOARD_WORD:
+        return None
+
+    words = words[1:]
+    if words[0].isdigit():
+        return int(words[0]), words[:1], words[1:]
+
+    board = None
+    for number, spelling in enumerate(_spellings(boards), 1):
+        if (len(spelling) < len(words) and tuple(words[:len(spelling)]) == spelling
+                and (board is None or len(spelling) > len(board[1]))):
+            board = (number, words[:len(spelling)], words[len(spelling):])
+
+    return board
+
+
+def parse_board_command(text, boards):
+    """
+    Returns (board number, card number), both 1-based, for a command such as "board two seven" (what the
+    recognizer makes of "board two, seven") on a kiosk of boards boards, or None.
+    """
+    board = _split_board(_number_words(text), boards)
+    if board is None or not 1 <= board[0] <= boards:
+        return None
+
+    card_number = parse_card_number(" ".join(board[2]))
+
+    return None if card_number is None else (board[0], card_number)
+
+
+def is_unambiguous(text, max_number=20):
+    """
+    Returns True if a partial result can be committed before the recognizer finalizes it: it names a card and
+    no other card number up to max_number starts the same way ("six" may become "sixteen", "twenty" may become
+    "twenty one", "seven" on a 12 card board cannot change).
+    """
+    number = parse_card_number(text)
+
+    if number is None or number > max_number:
+        return False
+
+    words = _number_words(text)
+    head, last_word = words[:-1], words[-1]
+
+    for spelling in _spellings(max_number):
+        if (len(spelling) >= len(words) and list(spelling[:len(head)]) == head
+                and spelling[len(head)].startswith(last_word) and spelling != tuple(words)):
+            return False
+
+    return True
+
+
+def is_unambiguous_board_command(text, max_number=20, boards=1):
+    """
+    Like is_unambiguous() for a board command: the board number must be complete ("board twenty" may still
+    become "board twenty one" on a kiosk of more than twenty boards) and the card number unambiguous.
+    """
+    board = _split_board(_number_words(text), boards)
+    if board is None or not 1 <= board[0] <= boards:
+        return False
+
+    head = tuple(board[1])
+    if any(len(spelling) > len(head) and spelling[:len(head)] == head for spelling in _spellings(boards)):
+        return False
+
+    return is_unambiguous(" ".join(board[2]), max_number)
+
+
+class VoiceDecoder:
+    """
+    Feeds audio blocks to a grammar-constrained recognizer and turns its results into commands.
+    Unambiguous partial results are committed as soon as they are stable for one block instead of waiting
+    for the recognizer to detect the end of the utterance. With boards, commands start with a board number.
+    """
+
+    def __init__(self, recognizer, max_number=20, boards=0):
+        self.recognizer = recognizer
+        self.max_number = max_number  # Highest card number on the board, to tell if a partial is final
+        self.boards = boards
+        self._partial = ''
+        self._speech_end = None  # Capture time of the block in which the partial text last changed
+        self._committed = None
+
+    def feed(self, data, captured):
+        """
+        Processes one audio block captured at time captured. Returns a list of (command, speech_end) pairs,
+        where speech_end is the capture time of the block that completed the command's words.
+        """
+        commands = []
+
+        if self.recognizer.AcceptWaveform(data):
+            self._finish(self.recognizer.Result(), captured, commands)
+        else:
+            text = json.loads(self.recognizer.PartialResult()).get('partial', '').strip().lower()
+
+            if text != self._partial:
+                self._partial = text
+                self._speech_end = captured
+            elif text and text != self._committed and self._is_complete(text):
+                commands.append((text, self._speech_end))
+                self._committed = text
+
+        return commands
+
+    def _is_complete(self, text):
+        if self.boards:
+            return is_unambiguous_board_command(text, self.max_number, self.boards)
+
+        return is_unambiguous(text, self.max_number)
+
+    def flush(self, captured):
+        """
+        Forces the recognizer to finalize the current utterance, e.g. once the speech gate has closed.
+        Returns the same kind of list as feed().
+        """
+        commands = []
+        self._finish(self.recognizer.FinalResult(), captured, commands)
+
+        return commands
+
+    def _finish(self, result, captured, commands):
+        text = json.loads(result).get('text', '').strip().lower()
+
+        # The final result repeats what was already committed from the partial results
+        if text and text != self._committed:
+            commands.append((text, self._speech_end or captured))
+
+        self._partial = ''
+        self._speech_end = None
+        self._committed = None
+
+
+class SpeechGate:
+    """
+    Energy-based voice activity gate for 16-bit mono audio. Silent blocks are held in a short pre-roll
+    buffer instead of reaching the recognizer; once a block is louder than the adaptive noise floor the
+    pre-roll and the following blocks are passed through until hangover_blocks quiet blocks in a row.
+    While the gate is open the floor still follows the quietest block of the last floor_window blocks, so a
+    lasting rise in background noise (a fan, a crowd) closes the gate again instead of holding it open.
+    """
+
+    def __init__(self, min_rms=300, ratio=3.0, preroll_blocks=4, hangover_blocks=6, floor_window=32):
+        self.min_rms = min_rms
+        self.ratio = ratio
+        self.hangover_blocks = hangover_blocks
+        self.noise_floor = min_rms / ratio
+        self.open = False
+        self._quiet_blocks = 0
+        self._preroll = deque(maxlen=preroll_blocks)
+        self._recent = deque(maxlen=floor_window)  # RMS of the latest blocks, for the floor while open
+
+    def process(self, data):
+        """
+        Returns (blocks, ended): the blocks to pass to the recognizer for this input block, and whether
+        speech just ended so the recognizer should finalize.
+        """
+        samples = array('h', data)
+        rms = (sum(map(operator.mul, samples, samples)) / max(1, len(samples))) ** 0.5
+        self._recent.append(rms)
+        loud = rms > max(self.min_rms, self.noise_floor * self.ratio)
+
+        if not self.open:
+            if not loud:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms  # Track the background level
+                self._preroll.append(data)
+                return [], False
+
+            self.open = True
+            self._quiet_blocks = 0
+            blocks = list(self._preroll) + [data]
+            self._preroll.clear()
+            return blocks, False
+
+        # Speech has pauses between words, so a window that is loud all the way through is the background
+        if len(self._recent) == self._recent.maxlen and min(self._recent) > self.noise_floor:
+            self.noise_floor = min(self._recent)
+            loud = rms > max(self.min_rms, self.noise_floor * self.ratio)
+
+        if loud:
+            self._quiet_blocks = 0
+            return [data], False
+
+        self._quiet_blocks += 1
+
+        if self._quiet_blocks >= self.hangover_blocks:
+            self.open = False
+            return [data], True
+
+        return [data], False
+
+
+class VoicePipeline:
+    """
+    Speech gate in front of a VoiceDecoder. Keeps counters of the audio frames seen and actually processed
+    by the recognizer, and of the CPU time spent in the gate and in the recognizer.
+    """
+
+    def __init__(self, recognizer, gate=None, sample_width=2, max_number=20, boards=0):
+        self.decoder = VoiceDecoder(recognizer, max_number, boards)
+        self.gate = gate or SpeechGate()
+        self.sample_width = sample_width
+        self.frames_seen = 0
+        self.frames_processed = 0
+        self.gate_cpu_time = 0.0
+        self.recognizer_cpu_time = 0.0
+
+    def process(self, data, captured):
+        """
+        Runs one captured audio block through the gate and, if it is open, the recognizer.
+        Returns the same kind of list as VoiceDecoder.feed().
+        """
+        started = time.thread_time()
+        blocks, speech_ended = self.gate.process(data)
+        gated = time.thread_time()
+
+        commands = []
+        for block in blocks:
+            commands.extend(self.decoder.feed(block, captured))
+            self.frames_processed += len(block) // self.sample_width
+
+        if speech_ended:
+            commands.extend(self.decoder.flush(captured))
+
+        self.frames_seen += len(data) // self.sample_width
+        self.gate_cpu_time += gated - started
+        self.recognizer_cpu_time += time.thread_time() - gated
+
+        return commands
+
+    def stats(self):
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_processed': self.frames_processed,
+            'frames_skipped': self.frames_seen - self.frames_processed,
+            'gate_cpu_ms': round(self.gate_cpu_time * 1000, 1),
+            'recognizer_cpu_ms': round(self.recognizer_cpu_time * 1000, 1),
+        }
+
+
+def latency_summary(latencies):
+    """
+    Returns a one-line summary of end-of-speech to card-selection latencies given in seconds.
+    """
+    if not latencies:
+        return "no voice commands"
+
+    ordered = sorted(latencies)
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+
+    return (f"{len(ordered)} commands, median {statistics.median(ordered) * 1000:.0f} ms, "
+            f"p90 {p90 * 1000:.0f} ms, max {ordered[-1] * 1000:.0f} ms")